@@ -10,65 +10,169 @@ bl_info = {
     "category": "Mesh"}
 
 
+def get_module_mtimes():
+    """
+    return the modification times of all the addon's python files, keyed by their dotted module path relative to the addon, like 'utils.mesh'
+    """
+
+    import os
+
+    root = __path__[0]
+    mtimes = {}
+
+    for path, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if not d.startswith(('.', '__'))]
+
+        for f in files:
+            if f.endswith('.py') and f != '__init__.py':
+                filepath = os.path.join(path, f)
+                relpath = os.path.relpath(filepath, root)[:-3]
+
+                mtimes[".".join(relpath.split(os.sep))] = os.path.getmtime(filepath)
+
+    return mtimes
+
+
+def get_module_imports(module, mtimes):
+    """
+    return the addon modules, that the passed in module imports from via relative imports, including the ones imported inside functions
+    """
+
+    import os
+    import ast
+
+    filepath = os.path.join(__path__[0], *module.split('.')) + ".py"
+
+    with open(filepath, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filepath)
+
+    imports = set()
+    package = module.split('.')[:-1]
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.level:
+            base = package[:len(package) - (node.level - 1)]
+
+            if node.module:
+                base = base + node.module.split('.')
+
+            for alias in node.names:
+                # from .. utils import mesh
+                submodule = ".".join(base + [alias.name])
+
+                if submodule in mtimes:
+                    imports.add(submodule)
+
+                # from .. utils.mesh import get_coords
+                elif ".".join(base) in mtimes:
+                    imports.add(".".join(base))
+
+    imports.discard(module)
+    return imports
+
+
 def reload_modules(name):
     """
     This makes sure all modules are reloaded from new files, when the addon is removed and a new version is installed in the same session,
     or when Blender's 'Reload Scripts' operator is run manually.
-    It's important, that utils modules are reloaded first, as operators and menus import from them
+    Only modules whose files changed since the last (re)load are reloaded, along with all the modules importing from them.
+    Modules are reloaded in dependency order, so utils modules are reloaded before the operators and menus that import them
     """
 
-    import os
+    import sys
+    import time
     import importlib
 
-    # first fetch and reload all utils modules
-    utils_modules = sorted([name[:-3] for name in os.listdir(os.path.join(__path__[0], "utils")) if name.endswith('.py')])
+    global module_mtimes, module_imports
 
-    for module in utils_modules:
-        impline = "from . utils import %s" % (module)
+    mtimes = get_module_mtimes()
 
-        print("reloading %s" % (".".join([name] + ['utils'] + [module])))
+    # without a record of previous mtimes (like after updating from an older version), everything needs to be reloaded
+    previous = globals().get('module_mtimes', {})
+    changed = {module for module, mtime in mtimes.items() if previous.get(module) != mtime}
 
-        exec(impline)
-        importlib.reload(eval(module))
 
-    # then update the classes and keys dicts
-    from . import registration
-    importlib.reload(registration)
+    # build the dependency graph, only re-parsing the modules that changed
 
-    # and based on that, reload the modules containing operator and menu classes
-    modules = []
+    cache = globals().get('module_imports', {})
+    imports = {}
 
-    for label in registration.classes:
-        entries = registration.classes[label]
-        for entry in entries:
-            path = entry[0].split('.')
-            module = path.pop(-1)
+    for module, mtime in mtimes.items():
+        if module in cache and cache[module][0] == mtime:
+            imports[module] = cache[module]
+        else:
+            imports[module] = (mtime, get_module_imports(module, mtimes))
 
-            if (path, module) not in modules:
-                modules.append((path, module))
+    dependents = {module: set() for module in mtimes}
 
-    for path, module in modules:
-        if path:
-            impline = "from . %s import %s" % (".".join(path), module)
-        else:
-            impline = "from . import %s" % (module)
+    for module, (_, deps) in imports.items():
+        for dep in deps:
+            dependents[dep].add(module)
+
+
+    # collect the changed modules and everything depending on them
+
+    stale = set()
+    seen = list(changed)
+
+    while seen:
+        module = seen.pop()
+
+        if module not in stale:
+            stale.add(module)
+            seen.extend(dependents[module])
+
+
+    # sort them, so each module is reloaded after the modules it imports from, cycles are broken by visiting utils modules first
+
+    order = []
+    visited = set()
+
+    def visit(module):
+        if module not in visited:
+            visited.add(module)
+
+            for dep in sorted(imports[module][1] & stale, key=lambda m: (not m.startswith('utils.'), m)):
+                visit(dep)
+
+            order.append(module)
 
-        print("reloading %s" % (".".join([name] + path + [module])))
+    for module in sorted(stale, key=lambda m: (not m.startswith('utils.'), m)):
+        visit(module)
 
-        exec(impline)
-        importlib.reload(eval(module))
+
+    # reload, modules not imported yet, will be imported fresh on registration anyway
+
+    for module in order:
+        mod = sys.modules.get("%s.%s" % (__name__, module))
+
+        if mod:
+            start = time.time()
+            importlib.reload(mod)
+
+            print("reloading %s - %.2f ms" % (".".join([name, module]), (time.time() - start) * 1000))
+
+    print("reloaded %d of %d modules" % (len([m for m in order if "%s.%s" % (__name__, m) in sys.modules]), len(mtimes)))
+
+    module_mtimes = mtimes
+    module_imports = imports
 
 
 if 'bpy' in locals():
     reload_modules(bl_info['name'])
 
+else:
+    module_mtimes = get_module_mtimes()
+    module_imports = {}
+
 import bpy
 from bpy.props import PointerProperty
 from . properties import M3SceneProperties
 from . utils.registration import get_core, get_tools, get_pie_menus, get_menus
 from . utils.registration import register_classes, unregister_classes, register_keymaps, unregister_keymaps, register_icons, unregister_icons, add_object_context_menu, remove_object_context_menu
-from . utils.registration import add_object_buttons
-from . handlers import update_object_axes_drawing
+from . utils.registration import add_object_buttons, get_prefs
+from . utils.developer import instrument_pie_draws
+from . handlers import update_object_axes_drawing, update_mesh_arrays, update_scene_index, auto_colorize_materials, clear_caches
 
 
 # TODO: support translation, see https://blendermarket.com/inbox/conversations/20371
@@ -105,12 +209,27 @@ def register():
     icons = register_icons()
 
 
+    # PIE DRAW TIMINGS
+
+    prefs = get_prefs()
+
+    if prefs.pie_draw_timings:
+        instrument_pie_draws(True, budget=prefs.pie_draw_budget)
+
+
     # HANDLERS
 
     bpy.app.handlers.undo_pre.append(update_object_axes_drawing)
     bpy.app.handlers.redo_pre.append(update_object_axes_drawing)
     bpy.app.handlers.load_pre.append(update_object_axes_drawing)
 
+    bpy.app.handlers.depsgraph_update_post.append(update_mesh_arrays)
+    bpy.app.handlers.depsgraph_update_post.append(update_scene_index)
+    bpy.app.handlers.depsgraph_update_post.append(auto_colorize_materials)
+    bpy.app.handlers.undo_post.append(clear_caches)
+    bpy.app.handlers.redo_post.append(clear_caches)
+    bpy.app.handlers.load_post.append(clear_caches)
+
 
     # REGISTRATION OUTPUT
 
@@ -126,6 +245,13 @@ def unregister():
     bpy.app.handlers.redo_pre.remove(update_object_axes_drawing)
     bpy.app.handlers.load_pre.remove(update_object_axes_drawing)
 
+    bpy.app.handlers.depsgraph_update_post.remove(update_mesh_arrays)
+    bpy.app.handlers.depsgraph_update_post.remove(update_scene_index)
+    bpy.app.handlers.depsgraph_update_post.remove(auto_colorize_materials)
+    bpy.app.handlers.undo_post.remove(clear_caches)
+    bpy.app.handlers.redo_post.remove(clear_caches)
+    bpy.app.handlers.load_post.remove(clear_caches)
+
 
     # TOOLS, PIE MENUS, KEYMAPS, MENUS
 
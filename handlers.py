@@ -1,7 +1,78 @@
+import bpy
 from bpy.app.handlers import persistent
 from . utils.draw import remove_object_axes_drawing_handler
+from . utils.mesh import invalidate_mesh_arrays
+from . utils.object import update_object_index, object_index
+from . utils.collection import update_collection_index, collection_indices
+from . utils.shading import update_world_backgrounds, world_backgrounds
+from . utils.material import colorize_materials, update_material_index, material_index
+from . utils.registration import get_prefs
 
 
 @persistent
 def update_object_axes_drawing(none):
     remove_object_axes_drawing_handler()
+
+
+@persistent
+def update_mesh_arrays(scene, depsgraph=None):
+    """
+    mark the cached arrays of meshes with geometry updates dirty
+    """
+
+    if depsgraph is None:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+
+    meshes = set()
+
+    for update in depsgraph.updates:
+        if update.is_updated_geometry:
+            id = update.id.original
+
+            if isinstance(id, bpy.types.Mesh):
+                meshes.add(id)
+
+            elif isinstance(id, bpy.types.Object) and id.type == 'MESH':
+                meshes.add(id.data)
+
+    if meshes:
+        invalidate_mesh_arrays(meshes)
+
+
+@persistent
+def update_scene_index(scene, depsgraph=None):
+    if depsgraph is None:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+
+    update_object_index(depsgraph)
+    update_collection_index(depsgraph)
+    update_world_backgrounds(depsgraph)
+    update_material_index(depsgraph)
+
+
+@persistent
+def auto_colorize_materials(scene, depsgraph=None):
+    """
+    set the viewport colors of materials, that were updated, from their color inputs
+    """
+
+    if not get_prefs().auto_colorize_materials:
+        return
+
+    if depsgraph is None:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+
+    if depsgraph.id_type_updated('MATERIAL'):
+        materials = {update.id.original for update in depsgraph.updates if isinstance(update.id, bpy.types.Material)}
+
+        # setting the viewport colors causes another update, in which the fingerprints will match
+        colorize_materials(materials, default=get_prefs().auto_colorize_lighten, auto=True)
+
+
+@persistent
+def clear_caches(none):
+    invalidate_mesh_arrays()
+    object_index.clear()
+    collection_indices.clear()
+    world_backgrounds.clear()
+    material_index.clear()
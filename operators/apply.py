@@ -4,6 +4,7 @@ import bmesh
 from mathutils import Vector, Quaternion
 from .. utils.registration import get_addon
 from .. utils.math import flatten_matrix, get_loc_matrix, get_rot_matrix, get_sca_matrix
+from .. utils.mesh import invalidate_mesh_arrays
 
 
 # TODO: updare child parent inverse mx?
@@ -64,6 +65,8 @@ class Apply(bpy.types.Operator):
                 bm.to_mesh(obj.data)
                 bm.clear()
 
+                invalidate_mesh_arrays(obj.data)
+
                 # zero out the transformations on the object level
                 if self.rotation and self.scale:
                     applymx = get_loc_matrix(loc) @ get_rot_matrix(Quaternion()) @ get_sca_matrix(Vector.Fill(3, 1))
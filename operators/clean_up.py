@@ -1,6 +1,7 @@
 import bpy
 from bpy.props import BoolProperty, EnumProperty, FloatProperty
 import bmesh
+from .. utils.mesh import EditMesh
 import math
 
 
@@ -100,9 +101,7 @@ class CleanUp(bpy.types.Operator):
         return {'FINISHED'}
 
     def clean_up(self, active):
-        bm = bmesh.from_edit_mesh(active.data)
-        bm.normal_update()
-        bm.verts.ensure_lookup_table()
+        bm = EditMesh(active.data, normals=self.recalc_normals).bm
 
         if self.remove_doubles:
             bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=self.distance)
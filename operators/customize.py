@@ -2,8 +2,9 @@ import bpy
 from mathutils import Matrix
 import os
 import shutil
-from .. utils.registration import get_prefs
+from .. utils.registration import get_prefs, get_keymap_index, find_keymap_items
 from .. utils.system import makedir
+from .. utils.shading import invalidate_studio_lights
 
 
 # TODO: do the prefs part based on a dictionary?
@@ -50,357 +51,239 @@ class Customize(bpy.types.Operator):
         return {'FINISHED'}
 
     def customize_keymap(self, context):
-        def modify_keymaps(kc):
+        def deactivate(kmi):
+            kmi.active = False
 
-            # WINDOW
-            km = kc.keymaps.get("Window")
-            for kmi in km.keymap_items:
-                if kmi.idname == "wm.open_mainfile":
-                    kmi.active = False
+        def toggle_select_all(kmi):
+            if kmi.properties.action == "SELECT":
+                kmi.properties.action = "TOGGLE"
 
-                if kmi.idname == "wm.doc_view_manual_ui_context":
-                    kmi.active = False
+            elif kmi.properties.action == "DESELECT":
+                kmi.active = False
 
-            for kmi in km.keymap_items:
-                if kmi.idname == "wm.save_as_mainfile":
-                    kmi.active = False
+        def deactivate_tweak(kmi):
+            if kmi.map_type == "TWEAK":
+                kmi.active = False
 
+        def set_event(**kwargs):
+            def modify(kmi):
+                for name, value in kwargs.items():
+                    setattr(kmi, name, value)
+            return modify
 
-            # SCREEN
+        def get_rules():
+            """
+            the keymap modifications, per keymap and per keymap item idname
+            """
 
-            km = kc.keymaps.get("Screen")
-            for kmi in km.keymap_items:
-                if kmi.idname == "ed.undo":
-                    kmi.type = "F1"
-                    kmi.ctrl = False
-
-                if kmi.idname == "ed.redo":
-                    kmi.type = "F2"
-                    kmi.ctrl = False
-                    kmi.shift = False
+            # SCREEN
 
-                if kmi.idname == "ed.undo_history":
-                    kmi.type = "F1"
+            def screen_full_area(kmi):
+                if kmi.properties.use_hide_panels:
+                    kmi.shift = True
+                    kmi.alt = False
                     kmi.ctrl = False
-                    kmi.alt = True
-
-                if kmi.idname == "screen.redo_last":
-                    kmi.type = "BUTTON4MOUSE"
-
-            # SCREEN EDITING
 
-            km = kc.keymaps.get("Screen Editing")
-            for kmi in km.keymap_items:
-                if kmi.idname == "screen.screen_full_area":
-                    if kmi.properties.use_hide_panels:
-                        kmi.shift = True
-                        kmi.alt = False
-                        kmi.ctrl = False
+                    kmi.type = 'SPACE'
+                    kmi.value = 'PRESS'
 
-                        kmi.type = 'SPACE'
-                        kmi.value = 'PRESS'
-
-                    else:
-                        kmi.active = False
-
-            # FRAMES
-
-            km = kc.keymaps.get("Frames")
-            for kmi in km.keymap_items:
-                if kmi.idname == "screen.animation_play":
+                else:
                     kmi.active = False
 
 
             # OUTLINER
 
-            km = kc.keymaps.get("Outliner")
-            for kmi in km.keymap_items:
-                if kmi.idname == "outliner.show_active":
-                    if kmi.type == "PERIOD":
-                        kmi.type = "F"
+            def outliner_show_active(kmi):
+                if kmi.type == "PERIOD":
+                    kmi.type = "F"
 
 
             # 3D VIEW
 
-            km = kc.keymaps.get("3D View")
-            for kmi in km.keymap_items:
-                if kmi.idname == "view3d.view_selected":
-                    if kmi.type == "NUMPAD_PERIOD" and not kmi.properties.use_all_regions:
-                        kmi.type = "F"
-
-                if kmi.idname == "view3d.cursor3d":
-                    kmi.type = "RIGHTMOUSE"
-                    kmi.alt = True
-                    kmi.shift = False
-                    kmi.properties.orientation = "GEOM"
-
-                # NOTE: changing these from  CLICK to PRESS seems to introduce weird behavior where blender always selects the object in the back, not in the front
-                # ####: this applies only to the new "just select" tool. for it seems that work properly, it needs to remain at CLICK - but it still acts as it PRESS was set, odd
-                # ####: also the new box select tool, can now be set to PRESS and will still work just fine
-                if kmi.idname == "view3d.select":
-                    if kmi.value == "CLICK":
-                        if not any([getattr(kmi.properties, name, False) for name in ["extend", "deselect", "toggle", "center", "enumerate", "object"]]):
-                            kmi.value = "PRESS"
-
-                        elif kmi.properties.toggle and not any([getattr(kmi.properties, name, False) for name in ["extend", "deselect", "center", "enumerate", "object"]]):
-                            kmi.value = "PRESS"
-
-                        elif kmi.properties.enumerate and not any([getattr(kmi.properties, name, False) for name in ["extend", "deselect", "toggle", "center", "object"]]):
-                            kmi.value = "PRESS"
+            def view3d_view_selected(kmi):
+                if kmi.type == "NUMPAD_PERIOD" and not kmi.properties.use_all_regions:
+                    kmi.type = "F"
+
+            def view3d_cursor3d(kmi):
+                kmi.type = "RIGHTMOUSE"
+                kmi.alt = True
+                kmi.shift = False
+                kmi.properties.orientation = "GEOM"
+
+            # NOTE: changing these from  CLICK to PRESS seems to introduce weird behavior where blender always selects the object in the back, not in the front
+            # ####: this applies only to the new "just select" tool. for it seems that work properly, it needs to remain at CLICK - but it still acts as it PRESS was set, odd
+            # ####: also the new box select tool, can now be set to PRESS and will still work just fine
+            def view3d_select(kmi):
+                if kmi.value == "CLICK":
+                    if not any([getattr(kmi.properties, name, False) for name in ["extend", "deselect", "toggle", "center", "enumerate", "object"]]):
+                        kmi.value = "PRESS"
 
-                        else:
-                            kmi.active = False
+                    elif kmi.properties.toggle and not any([getattr(kmi.properties, name, False) for name in ["extend", "deselect", "center", "enumerate", "object"]]):
+                        kmi.value = "PRESS"
 
-                if kmi.idname == "transform.translate":
-                    if kmi.map_type == "TWEAK":
-                        kmi.active = False
+                    elif kmi.properties.enumerate and not any([getattr(kmi.properties, name, False) for name in ["extend", "deselect", "toggle", "center", "object"]]):
+                        kmi.value = "PRESS"
 
-                if kmi.idname == "view3d.view_axis":
-                    if kmi.map_type == "TWEAK":
+                    else:
                         kmi.active = False
 
-                if kmi.idname == "transform.tosphere":
-                    kmi.properties.value = 1
-
-                # if kmi.idname == "wm.context_toggle":  # gizmo toggle
-                    # kmi.active = False
-
-
-            # 3D VIEW TOOLS
-
-            km = kc.keymaps.get("3D View Tool: Cursor")
-            for kmi in km.keymap_items:
-                if kmi.idname == "view3d.cursor3d":
-                    kmi.active = False
-
-                if kmi.idname == "transform.translate":
-                    kmi.active = False
+            def transform_tosphere(kmi):
+                kmi.properties.value = 1
 
 
             # OBJECT MODE
 
-            km = kc.keymaps.get("Object Mode")
-            for kmi in km.keymap_items:
-                if kmi.idname == "object.select_all":
-                    if kmi.properties.action == "SELECT":
-                        kmi.properties.action = "TOGGLE"
-
-                    elif kmi.properties.action == "DESELECT":
-                        kmi.active = False
-
-                if kmi.idname == "object.delete":
-                    if kmi.type == "X" and kmi.shift:
-                        kmi.active = False
-
-
-            # OBJECT NON-MODAL
-
-            km = kc.keymaps.get("Object Non-modal")
-            for kmi in km.keymap_items:
-                if kmi.idname == "object.mode_set":
-                    kmi.active = False
-
-                if kmi.idname == "view3d.object_mode_pie_or_toggle":
-                    kmi.active = False
-
-
-            # IMAGE
-
-            km = kc.keymaps.get("Image")
-            for kmi in km.keymap_items:
-                if kmi.idname == "object.mode_set":
+            def object_delete(kmi):
+                if kmi.type == "X" and kmi.shift:
                     kmi.active = False
 
 
             # MESH
 
-            km = kc.keymaps.get("Mesh")
-            for kmi in km.keymap_items:
-
-                if kmi.idname == "wm.call_menu":
-                    if kmi.properties.name == "VIEW3D_MT_edit_mesh_select_mode":
-                        kmi.active = False
-
-                if kmi.idname == "mesh.select_all":
-                    if kmi.properties.action == "SELECT":
-                        kmi.properties.action = "TOGGLE"
-
-                    elif kmi.properties.action == "DESELECT":
-                        kmi.active = False
-
-                if kmi.idname == "mesh.edge_face_add" and kmi.type == "F":
+            def wm_call_menu(kmi):
+                if kmi.properties.name == "VIEW3D_MT_edit_mesh_select_mode":
                     kmi.active = False
 
-                if kmi.idname == "mesh.select_mode" and kmi.type in ["ONE", "TWO", "THREE"]:
+            def mesh_edge_face_add(kmi):
+                if kmi.type == "F":
                     kmi.active = False
 
-                if kmi.idname == "mesh.loop_select":
-                    if not any([getattr(kmi.properties, name, False) for name in ["extend", "deselect", "toggle", "ring"]]):
-                        kmi.active = False
-
-                    elif kmi.properties.toggle:
-                        kmi.value = "PRESS"
-                        kmi.shift = False
-
-                if kmi.idname == "mesh.edgering_select":
-                    if kmi.properties.ring and not any([getattr(kmi.properties, name, False) for name in ["extend", "deselect", "toggle"]]):
-                        kmi.active = False
+            def mesh_select_mode(kmi):
+                if kmi.type in ["ONE", "TWO", "THREE"]:
+                    kmi.active = False
 
-                    elif kmi.properties.toggle:
-                        kmi.value = "PRESS"
-                        kmi.shift = False
+            def mesh_loop_select(kmi):
+                if not any([getattr(kmi.properties, name, False) for name in ["extend", "deselect", "toggle", "ring"]]):
+                    kmi.active = False
 
-                if kmi.idname == "mesh.shortest_path_pick":
+                elif kmi.properties.toggle:
                     kmi.value = "PRESS"
-
-                if kmi.idname == "mesh.select_more":
-                    kmi.type = "WHEELUPMOUSE"
-                    kmi.shift = True
-                    kmi.ctrl = False
-
-                if kmi.idname == "mesh.select_less":
-                    kmi.type = "WHEELDOWNMOUSE"
-                    kmi.shift = True
-                    kmi.ctrl = False
-
-                if kmi.idname == "mesh.select_next_item":
-                    kmi.type = "WHEELUPMOUSE"
                     kmi.shift = False
 
-                if kmi.idname == "mesh.select_prev_item":
-                    kmi.type = "WHEELDOWNMOUSE"
+            def mesh_edgering_select(kmi):
+                if kmi.properties.ring and not any([getattr(kmi.properties, name, False) for name in ["extend", "deselect", "toggle"]]):
+                    kmi.active = False
+
+                elif kmi.properties.toggle:
+                    kmi.value = "PRESS"
                     kmi.shift = False
 
-                if kmi.idname == "mesh.select_linked":
+            def mesh_select_linked_pick(kmi):
+                if kmi.properties.deselect:
                     kmi.type = "LEFTMOUSE"
                     kmi.value = "DOUBLE_CLICK"
-                    kmi.ctrl = False
-                    kmi.shift = True
-
-                if kmi.idname == "mesh.select_linked_pick":
-                    if kmi.properties.deselect:
-                        kmi.type = "LEFTMOUSE"
-                        kmi.value = "DOUBLE_CLICK"
-                        kmi.alt = True
-
-                    else:
-                        kmi.active = False
+                    kmi.alt = True
 
-                if kmi.idname == "object.subdivision_set":
+                else:
                     kmi.active = False
 
-                if kmi.idname == "mesh.merge":
-                    kmi.alt = False
-
 
-            # CURVE
+            return {"Window": {"wm.open_mainfile": deactivate,
+                               "wm.doc_view_manual_ui_context": deactivate,
+                               "wm.save_as_mainfile": deactivate},
 
-            km = kc.keymaps.get("Curve")
-            for kmi in km.keymap_items:
-                if kmi.idname == "curve.select_all":
-                    if kmi.properties.action == "SELECT":
-                        kmi.properties.action = "TOGGLE"
+                    "Screen": {"ed.undo": set_event(type="F1", ctrl=False),
+                               "ed.redo": set_event(type="F2", ctrl=False, shift=False),
+                               "ed.undo_history": set_event(type="F1", ctrl=False, alt=True),
+                               "screen.redo_last": set_event(type="BUTTON4MOUSE")},
 
-                    elif kmi.properties.action == "DESELECT":
-                        kmi.active = False
+                    "Screen Editing": {"screen.screen_full_area": screen_full_area},
 
+                    "Frames": {"screen.animation_play": deactivate},
 
-            # ARMATURE
+                    "Outliner": {"outliner.show_active": outliner_show_active},
 
-            km = kc.keymaps.get("Armature")
-            for kmi in km.keymap_items:
-                if kmi.idname == "armature.select_all":
-                    if kmi.properties.action == "SELECT":
-                        kmi.properties.action = "TOGGLE"
+                    "3D View": {"view3d.view_selected": view3d_view_selected,
+                                "view3d.cursor3d": view3d_cursor3d,
+                                "view3d.select": view3d_select,
+                                "transform.translate": deactivate_tweak,
+                                "view3d.view_axis": deactivate_tweak,
+                                # "wm.context_toggle": deactivate,  # gizmo toggle
+                                "transform.tosphere": transform_tosphere},
 
-                    elif kmi.properties.action == "DESELECT":
-                        kmi.active = False
+                    "3D View Tool: Cursor": {"view3d.cursor3d": deactivate,
+                                             "transform.translate": deactivate},
 
+                    "Object Mode": {"object.select_all": toggle_select_all,
+                                    "object.delete": object_delete},
 
-            # POSE
-
-            km = kc.keymaps.get("Pose")
-            for kmi in km.keymap_items:
-                if kmi.idname == "pose.select_all":
-                    if kmi.properties.action == "SELECT":
-                        kmi.properties.action = "TOGGLE"
-
-                    elif kmi.properties.action == "DESELECT":
-                        kmi.active = False
+                    "Object Non-modal": {"object.mode_set": deactivate,
+                                         "view3d.object_mode_pie_or_toggle": deactivate},
 
+                    "Image": {"object.mode_set": deactivate},
 
-            # UV EDITOR
+                    "Mesh": {"wm.call_menu": wm_call_menu,
+                             "mesh.select_all": toggle_select_all,
+                             "mesh.edge_face_add": mesh_edge_face_add,
+                             "mesh.select_mode": mesh_select_mode,
+                             "mesh.loop_select": mesh_loop_select,
+                             "mesh.edgering_select": mesh_edgering_select,
+                             "mesh.shortest_path_pick": set_event(value="PRESS"),
+                             "mesh.select_more": set_event(type="WHEELUPMOUSE", shift=True, ctrl=False),
+                             "mesh.select_less": set_event(type="WHEELDOWNMOUSE", shift=True, ctrl=False),
+                             "mesh.select_next_item": set_event(type="WHEELUPMOUSE", shift=False),
+                             "mesh.select_prev_item": set_event(type="WHEELDOWNMOUSE", shift=False),
+                             "mesh.select_linked": set_event(type="LEFTMOUSE", value="DOUBLE_CLICK", ctrl=False, shift=True),
+                             "mesh.select_linked_pick": mesh_select_linked_pick,
+                             "object.subdivision_set": deactivate,
+                             "mesh.merge": set_event(alt=False)},
 
-            km = kc.keymaps.get("UV Editor")
-            for kmi in km.keymap_items:
-                if kmi.idname == "uv.select_all":
-                    if kmi.properties.action == "SELECT":
-                        kmi.properties.action = "TOGGLE"
+                    "Curve": {"curve.select_all": toggle_select_all},
 
-                    elif kmi.properties.action == "DESELECT":
-                        kmi.active = False
+                    "Armature": {"armature.select_all": toggle_select_all},
 
-                if kmi.idname == "mesh.select_mode":
-                    kmi.active = False
+                    "Pose": {"pose.select_all": toggle_select_all},
 
-                if kmi.idname == "wm.context_set_enum":
-                    kmi.active = False
+                    "UV Editor": {"uv.select_all": toggle_select_all,
+                                  "mesh.select_mode": deactivate,
+                                  "wm.context_set_enum": deactivate,
+                                  "uv.select": set_event(value="PRESS"),
+                                  "uv.select_loop": set_event(value="PRESS"),
+                                  "uv.select_more": set_event(type="WHEELUPMOUSE", shift=True, ctrl=False),
+                                  "uv.select_less": set_event(type="WHEELDOWNMOUSE", shift=True, ctrl=False),
+                                  "transform.translate": deactivate_tweak,
+                                  "uv.cursor_set": set_event(alt=True, shift=False)},
 
-                if kmi.idname == "uv.select":
-                    kmi.value = "PRESS"
+                    "Image Editor Tool: Uv, Cursor": {"transform.translate": deactivate_tweak,
+                                                      "uv.cursor_set": deactivate}}
 
-                if kmi.idname == "uv.select_loop":
-                    kmi.value = "PRESS"
+        def modify_keymaps(kc, rules):
+            """
+            apply all rules of a keymap in a single pass over a snapshot of its items
+            """
 
-                if kmi.idname == "uv.select_more":
-                    kmi.type = "WHEELUPMOUSE"
-                    kmi.shift = True
-                    kmi.ctrl = False
+            for name, kmrules in rules.items():
+                km = kc.keymaps.get(name)
 
-                if kmi.idname == "uv.select_less":
-                    kmi.type = "WHEELDOWNMOUSE"
-                    kmi.shift = True
-                    kmi.ctrl = False
-
-                if kmi.idname == "transform.translate":
-                    if kmi.map_type == "TWEAK":
-                        kmi.active = False
-
-                if kmi.idname == "uv.cursor_set":
-                    kmi.alt = True
-                    kmi.shift = False
-
-
-            # IMAGE EDITOR TOOL: UV, CURSOR
-
-            km = kc.keymaps.get("Image Editor Tool: Uv, Cursor")
-            for kmi in km.keymap_items:
-                if kmi.idname == "transform.translate":
-                    if kmi.map_type == "TWEAK":
-                        kmi.active = False
-
-                if kmi.idname == "uv.cursor_set":
-                    kmi.active = False
+                if km:
+                    index = get_keymap_index(km)
 
+                    for idname, modify in kmrules.items():
+                        for kmi in index.get(idname, []):
+                            modify(kmi)
 
         def add_keymaps(kc):
             # MESH
             km = kc.keymaps.get("Mesh")
 
-            kmi = km.keymap_items.new("mesh.loop_multi_select", "LEFTMOUSE", "CLICK_DRAG", alt=True)
-            kmi.properties.ring = False
+            # avoid adding duplicates, when customizing repeatedly
+            index = get_keymap_index(km)
 
-            kmi = km.keymap_items.new("mesh.loop_multi_select", "LEFTMOUSE", "CLICK_DRAG", alt=True, ctrl=True)
-            kmi.properties.ring = True
+            items = [{"idname": "mesh.loop_multi_select", "type": "LEFTMOUSE", "value": "CLICK_DRAG", "alt": True, "properties": [("ring", False)]},
+                     {"idname": "mesh.loop_multi_select", "type": "LEFTMOUSE", "value": "CLICK_DRAG", "alt": True, "ctrl": True, "properties": [("ring", True)]},
+                     {"idname": "mesh.subdivide", "type": "TWO", "value": "PRESS", "alt": True},
+                     {"idname": "mesh.bridge_edge_loops", "type": "TWO", "value": "PRESS", "ctrl": True}]
 
-            kmi = km.keymap_items.new("mesh.subdivide", "TWO", "PRESS", alt=True)
-            # kmi.properties.smoothness = 1
+            for item in items:
+                if not find_keymap_items(index, item):
+                    kmi = km.keymap_items.new(item["idname"], item["type"], item["value"], shift=item.get("shift", False), ctrl=item.get("ctrl", False), alt=item.get("alt", False))
 
-            kmi = km.keymap_items.new("mesh.bridge_edge_loops", "TWO", "PRESS", ctrl=True)
+                    for name, value in item.get("properties", []):
+                        setattr(kmi.properties, name, value)
 
         kc = context.window_manager.keyconfigs.user
 
-        modify_keymaps(kc)
+        modify_keymaps(kc, get_rules())
 
         add_keymaps(kc)
 
@@ -536,6 +419,7 @@ class Customize(bpy.types.Operator):
 
 
         context.preferences.studio_lights.refresh()
+        invalidate_studio_lights()
 
         if all([mc in matcaps for mc in ["matcap_base.exr", "matcap_shiny_red.exr"]]):
             get_prefs().switchmatcap1 = "matcap_base.exr"
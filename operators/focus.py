@@ -1,7 +1,11 @@
 import bpy
+from mathutils import Vector
+from itertools import product
+import numpy as np
 from bpy.props import BoolProperty, EnumProperty, IntProperty
 from .. utils.registration import get_prefs, get_addon
-from .. utils.view import update_local_view
+from .. utils.view import update_local_view, set_view_to_bounds
+from .. utils.mesh import get_mesh_arrays
 from .. items import focus_method_items, focus_levels_items
 
 
@@ -51,15 +55,17 @@ class Focus(bpy.types.Operator):
         return {'FINISHED'}
 
     def view_selected(self, context):
-        mirrors = []
-
-        if context.mode == 'OBJECT':
+        if context.mode == 'OBJECT' and self.ignore_mirrors:
             sel = context.selected_objects
-            if self.ignore_mirrors:
-                mirrors = [mod for obj in sel for mod in obj.modifiers if mod.type == 'MIRROR' and mod.show_viewport]
+            mirrored = {obj for obj in sel if any(mod.type == 'MIRROR' and mod.show_viewport for mod in obj.modifiers)}
+
+            # frame the bounds folded back across the mirror axes directly, toggling the mirror mods would re-evaluate their entire modifier stacks, twice
+            if mirrored and context.space_data.region_3d.view_perspective != 'CAMERA':
+                bmin, bmax = self.get_bounds(context, sel, mirrored)
 
-                for mod in mirrors:
-                    mod.show_viewport = False
+                smooth = context.preferences.view.smooth_view if get_prefs().focus_view_transition else 0
+                set_view_to_bounds(context, bmin, bmax, smooth=smooth)
+                return
 
         if get_prefs().focus_view_transition:
             bpy.ops.view3d.view_selected('INVOKE_DEFAULT')
@@ -67,13 +73,79 @@ class Focus(bpy.types.Operator):
         else:
             bpy.ops.view3d.view_selected()
 
-        for mod in mirrors:
-            mod.show_viewport = True
+    def get_bounds(self, context, sel, mirrored):
+        """
+        get the world space bounds of the selection from the evaluated bounding boxes
+        for mirrored objects, the local bounds are folded back across the mirror axes, to the side the original geometry is on
+        """
+
+        depsgraph = context.evaluated_depsgraph_get()
+        coords = []
+
+        for obj in sel:
+            co = np.array(obj.evaluated_get(depsgraph).bound_box, np.float32)
+
+            if obj in mirrored:
+                co = self.fold_bounds(obj, co)
+
+            mx = np.array(obj.matrix_world, np.float32)
+            coords.append(co @ mx[:3, :3].T + mx[:3, 3])
+
+        coords = np.concatenate(coords)
+        return Vector(coords.min(axis=0)), Vector(coords.max(axis=0))
+
+    def fold_bounds(self, obj, co):
+        """
+        fold the local bound box corners across the axes of the mirror mods, that mirror across the object origin
+        the side is determined from the original, unmodified geometry, if it straddles the mirror plane, nothing is folded on that axis
+        """
+
+        original = self.get_original_coords(obj)
+
+        if original is None or not len(original):
+            return co
+
+        omin = original.min(axis=0)
+        omax = original.max(axis=0)
+
+        bmin = co.min(axis=0)
+        bmax = co.max(axis=0)
+
+        for mod in obj.modifiers:
+            if mod.type == 'MIRROR' and mod.show_viewport and not mod.mirror_object:
+                for axis, use in enumerate(mod.use_axis):
+                    if use:
+                        if omin[axis] >= 0:
+                            bmin[axis] = max(bmin[axis], 0)
+
+                        elif omax[axis] <= 0:
+                            bmax[axis] = min(bmax[axis], 0)
+
+        # all 8 corners, two opposite ones don't give the world space bounds of rotated objects
+        return np.array(list(product(*zip(bmin, bmax))), np.float32)
+
+    def get_original_coords(self, obj):
+        if obj.type == 'MESH':
+            return get_mesh_arrays(obj.data).co
+
+        elif obj.type in ['CURVE', 'SURFACE']:
+            coords = []
+
+            for spline in obj.data.splines:
+                coords.extend(tuple(p.co) for p in spline.bezier_points)
+                coords.extend(tuple(p.co)[:3] for p in spline.points)
+
+            return np.array(coords, np.float32).reshape(-1, 3)
+
+        elif obj.type == 'LATTICE':
+            return np.array([tuple(p.co) for p in obj.data.points], np.float32).reshape(-1, 3)
 
     def local_view(self, context, debug=False):
         def focus(context, view, sel, history, init=False):
             vis = context.visible_objects
-            hidden = [obj for obj in vis if obj not in sel]
+
+            selected = set(sel)
+            hidden = [obj for obj in vis if obj not in selected]
 
             if hidden:
                 # initialize
@@ -88,11 +160,13 @@ class Focus(bpy.types.Operator):
                 epoch = history.add()
                 epoch.name = "Epoch %d" % (len(history) - 1)
 
-                # store hidden objects in epoch
-                for obj in hidden:
-                    entry = epoch.objects.add()
-                    entry.obj = obj
-                    entry.name = obj.name
+                # store the hidden objects in the epoch, as pointers, which survive renames
+                # the first epoch doesn't need to store any, as the native local view toggle takes care of its hidden ones
+                if not init:
+                    for obj in hidden:
+                        entry = epoch.objects.add()
+                        entry.obj = obj
+                        entry.name = obj.name
 
                 # disable mirror mods and store these unmirrored objects
                 if self.unmirror:
@@ -115,7 +189,7 @@ class Focus(bpy.types.Operator):
 
             # unhide
             else:
-                update_local_view(view, [(entry.obj, True) for entry in last_epoch.objects])
+                update_local_view(view, [(entry.obj, True) for entry in last_epoch.objects if entry.obj])
 
             # re-enbable mirror mods
             for entry in last_epoch.unmirrored:
@@ -125,8 +199,7 @@ class Focus(bpy.types.Operator):
 
 
             # delete the last epoch
-            idx = history.keys().index(last_epoch.name)
-            history.remove(idx)
+            history.remove(len(history) - 1)
 
         view = context.space_data
         self.show_tool_props = False
@@ -179,5 +252,5 @@ class Focus(bpy.types.Operator):
                 focus(context, view, sel, history, init=True)
 
             if debug:
-                for epoch in history:
-                    print(epoch.name, ", hidden: ", [obj.name for obj in epoch.objects], ", unmirrored: ", [obj.name for obj in epoch.unmirrored])
+                for idx, epoch in enumerate(history):
+                    print(epoch.name, ", hidden: ", [entry.obj.name for entry in epoch.objects if entry.obj] if idx else "all but visible", ", unmirrored: ", [obj.name for obj in epoch.unmirrored])
@@ -1,7 +1,7 @@
 import bpy
 import bmesh
 from math import degrees
-from .. utils.mesh import unhide_deselect, join
+from .. utils.mesh import unhide_deselect, join, invalidate_mesh_arrays
 from .. utils.object import flatten
 
 
@@ -20,8 +20,7 @@ class MeshCut(bpy.types.Operator):
         cutter = [obj for obj in context.selected_objects if obj != target][0]
 
         # unhide both
-        unhide_deselect(target.data)
-        unhide_deselect(cutter.data)
+        unhide_deselect([target.data, cutter.data])
 
         # get depsgraph
         dg = context.evaluated_depsgraph_get()
@@ -100,4 +99,6 @@ class MeshCut(bpy.types.Operator):
         bm.to_mesh(target.data)
         bm.clear()
 
+        invalidate_mesh_arrays(target.data)
+
         return {'FINISHED'}
@@ -1,6 +1,7 @@
 import bpy
 from bpy.props import BoolProperty
 from .. utils.registration import get_addon
+from .. utils.object import get_indexed_objects
 
 
 decalmachine = None
@@ -199,15 +200,14 @@ class Unmirror(bpy.types.Operator):
 
     @classmethod
     def poll(cls, context):
-        mirror_meshes = [obj for obj in context.selected_objects if obj.type == "MESH" and any(mod.type == "MIRROR" for mod in obj.modifiers)]
-        if mirror_meshes:
-            return True
+        mirrored = set(get_indexed_objects('mirrored'))
 
-        mirror_gpencils = [obj for obj in context.selected_objects if obj.type == "GPENCIL" and any(mod.type == "GP_MIRROR" for mod in obj.grease_pencil_modifiers)]
-        if mirror_gpencils:
+        if any(obj in mirrored for obj in context.selected_objects if obj.type in ["MESH", "GPENCIL"]):
             return True
 
-        groups = [obj for obj in context.selected_objects if obj.type == "EMPTY" and obj.instance_collection]
+        instances = set(get_indexed_objects('instances'))
+
+        groups = [obj for obj in context.selected_objects if obj in instances]
         if groups:
             return [empty for empty in groups if any(obj for obj in empty.instance_collection.objects if any(mod.type == "MIRROR" for mod in obj.modifiers))]
 
@@ -1,6 +1,7 @@
 import bpy
 from bpy.props import BoolProperty
 import bmesh
+from .. utils.mesh import EditMesh
 
 
 class SmartEdge(bpy.types.Operator):
@@ -23,9 +24,7 @@ class SmartEdge(bpy.types.Operator):
     def execute(self, context):
         active = context.active_object
 
-        bm = bmesh.from_edit_mesh(active.data)
-        bm.normal_update()
-        bm.verts.ensure_lookup_table()
+        bm = EditMesh(active.data).bm
 
         edges = [e for e in bm.edges if e.select]
 
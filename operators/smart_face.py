@@ -1,6 +1,7 @@
 import bpy
 from bpy.props import BoolProperty
 import bmesh
+from .. utils.mesh import EditMesh
 
 
 class SmartFace(bpy.types.Operator):
@@ -31,9 +32,8 @@ class SmartFace(bpy.types.Operator):
 
         self.mode = tuple(ts.mesh_select_mode)
 
-        bm = bmesh.from_edit_mesh(active.data)
-        bm.normal_update()
-        bm.verts.ensure_lookup_table()
+        # the F3 face creation in vert and edge mode recalculates face normals
+        bm = EditMesh(active.data, normals=self.mode[0] or self.mode[1]).bm
 
         # vert and edge mode - create new face
         if self.mode[0] or self.mode[1]:
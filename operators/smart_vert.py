@@ -6,6 +6,8 @@ from gpu_extras.batch import batch_for_shader
 import bgl
 from .. utils.graph import get_shortest_path
 from .. utils.ui import wrap_mouse
+from .. utils.mesh import EditMesh, invalidate_mesh_arrays
+from .. utils.selection import get_selection_counts
 
 
 modeitems = [("MERGE", "Merge", ""),
@@ -36,8 +38,8 @@ class SmartVert(bpy.types.Operator):
     @classmethod
     def poll(cls, context):
         if context.mode == 'EDIT_MESH' and tuple(context.scene.tool_settings.mesh_select_mode) == (True, False, False):
-            bm = bmesh.from_edit_mesh(context.active_object.data)
-            return [v for v in bm.verts if v.select]
+            verts, _, _ = get_selection_counts(context.active_object.data)
+            return verts > 0
 
     def draw(self, context):
         layout = self.layout
@@ -130,6 +132,7 @@ class SmartVert(bpy.types.Operator):
 
         bpy.ops.object.mode_set(mode='OBJECT')
         self.initbm.to_mesh(self.active.data)
+        invalidate_mesh_arrays(self.active.data)
         bpy.ops.object.mode_set(mode='EDIT')
 
     def invoke(self, context, event):
@@ -175,9 +178,7 @@ class SmartVert(bpy.types.Operator):
         active = context.active_object
         topo = True if self.pathtype == "TOPO" else False
 
-        bm = bmesh.from_edit_mesh(active.data)
-        bm.normal_update()
-        bm.verts.ensure_lookup_table()
+        bm = EditMesh(active.data).bm
 
         verts = [v for v in bm.verts if v.select]
 
@@ -287,5 +288,6 @@ class SmartVert(bpy.types.Operator):
 
 
         bm.to_mesh(self.active.data)
+        invalidate_mesh_arrays(self.active.data)
 
         bpy.ops.object.mode_set(mode='EDIT')
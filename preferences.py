@@ -1,10 +1,11 @@
 import bpy
-from bpy.props import IntProperty, StringProperty, CollectionProperty, BoolProperty, EnumProperty
-import os
+from bpy.props import IntProperty, StringProperty, CollectionProperty, BoolProperty, EnumProperty, FloatProperty
 import rna_keymap_ui
 from . properties import AppendMatsCollection
 from . utils.ui import get_icon
-from . utils.registration import activate, get_path, get_name
+from . utils.registration import activate, get_path, get_name, get_keymap_index, find_keymap_items
+from . utils.developer import instrument_pie_draws
+from . utils.shading import get_studio_lights
 
 
 preferences_tabs = [("GENERAL", "常规", ""),
@@ -60,8 +61,7 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
             self.avoid_update = False
             return
 
-        matcaps = [mc.name for mc in context.preferences.studio_lights if os.path.basename(os.path.dirname(mc.path)) == "matcap"]
-        if self.switchmatcap1 not in matcaps:
+        if self.switchmatcap1 not in get_studio_lights('MATCAP'):
             self.avoid_update = True
             self.switchmatcap1 = "没有找到"
 
@@ -70,8 +70,7 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
             self.avoid_update = False
             return
 
-        matcaps = [mc.name for mc in context.preferences.studio_lights if os.path.basename(os.path.dirname(mc.path)) == "matcap"]
-        if self.switchmatcap2 not in matcaps:
+        if self.switchmatcap2 not in get_studio_lights('MATCAP'):
             self.avoid_update = True
             self.switchmatcap2 = "没有找到"
 
@@ -160,6 +159,12 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
         activate(self, register=self.activate_workspace_pie, tool="workspace_pie")
 
 
+    # PIE DRAW TIMINGS
+
+    def update_pie_draw_timings(self, context):
+        instrument_pie_draws(self.pie_draw_timings, budget=self.pie_draw_budget)
+
+
     # RUNTIME MENU ACTIVATION
 
     def update_activate_object_context_menu(self, context):
@@ -176,8 +181,20 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
     appendmatsIDX: IntProperty()
     appendmatsname: StringProperty(name="添加的材质名称", update=update_appendmatsname)
 
+    save_background_compression: BoolProperty(name="Background Compression", description="Save uncompressed, which is quicker, and compress the saved file in the background afterwards", default=False)
+    show_save_log: BoolProperty(name="Show Save Log", description="Show duration and size of recent saves in the Save pie", default=True)
+
+    use_incremental_store: BoolProperty(name="Incremental Store", description="Store incrementally saved versions as deduplicated chunks, which are saved uncompressed for that.\nPrevious versions are re-assembled on demand, when loading them via Load Previous/Next", default=False)
+    incremental_store_path: StringProperty(name="Store Location", description="Folder of the incremental store, leave empty to keep it in the folder of the blend files", subtype='DIR_PATH')
+    incremental_store_prune: BoolProperty(name="Prune Stored Versions", description="Remove the full .blend files of previous versions, once they are stored.\nOnly files written by Incremental Save are removed, they are re-assembled from the store on demand", default=False)
+
+    pie_draw_timings: BoolProperty(name="Pie Draw Timings", description="Time each draw of the pie menus, and print a warning for draws exceeding the budget", default=False, update=update_pie_draw_timings)
+    pie_draw_budget: FloatProperty(name="Budget (ms)", description="Time a pie menu draw may take, before it's reported", default=2, min=0.1, update=update_pie_draw_timings)
+
     switchmatcap1: StringProperty(name="材质捕获 1", update=update_switchmatcap1)
     switchmatcap2: StringProperty(name="材质捕获 2", update=update_switchmatcap2)
+    auto_colorize_materials: BoolProperty(name="Auto Colorize Materials", description="Set the viewport colors of materials from their Base Color or Color inputs, whenever these change", default=False)
+    auto_colorize_lighten: FloatProperty(name="Lighten", description="Lighten amount for materials, that weren't colorized before, otherwise the one they were last colorized with is used", default=0.05, min=0, max=1)
 
     obj_mode_rotate_around_active: BoolProperty(name="围绕选择项旋转，但只在物体模式下", default=False)
     toggle_cavity: BoolProperty(name="切换 空腔 / 曲率 在编辑模式下禁用 在物体模式下启用", default=True)
@@ -467,6 +484,18 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
 
             column = bb.column()
 
+            row = column.row()
+            row.prop(self, "save_background_compression", toggle=True)
+            row.prop(self, "show_save_log", toggle=True)
+
+            row = column.row()
+            row.prop(self, "use_incremental_store", toggle=True)
+            r = row.row()
+            r.active = self.use_incremental_store
+            r.prop(self, "incremental_store_path", text="")
+            r.prop(self, "incremental_store_prune", toggle=True)
+            column.separator()
+
             column.prop(self, "appendworldpath")
             column.prop(self, "appendworldname")
             column.separator()
@@ -510,6 +539,29 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
             row.prop(self, "switchmatcap1")
             row.prop(self, "switchmatcap2")
 
+            bb = b.box()
+            bb.label(text="Shading Pie: Colorize Materials")
+
+            row = bb.row()
+            row.prop(self, "auto_colorize_materials", toggle=True)
+
+            r = row.row()
+            r.active = self.auto_colorize_materials
+            r.prop(self, "auto_colorize_lighten")
+
+
+        # PIE DRAW TIMINGS
+
+        bb = b.box()
+        bb.label(text="Pie Menus: Draw Timings")
+
+        row = bb.row()
+        row.prop(self, "pie_draw_timings", toggle=True)
+
+        r = row.row()
+        r.active = self.pie_draw_timings
+        r.prop(self, "pie_draw_budget")
+
 
         # NO SETTINGS
 
@@ -580,6 +632,7 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
 
     def draw_keymap_items(self, kc, name, keylist, layout):
         drawn = False
+        indexes = {}
 
         for idx, item in enumerate(keylist):
             keymap = item.get("keymap")
@@ -589,20 +642,14 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
 
                 kmi = None
                 if km:
-                    idname = item.get("idname")
-
-                    for kmitem in km.keymap_items:
-                        if kmitem.idname == idname:
-                            properties = item.get("properties")
+                    if keymap not in indexes:
+                        indexes[keymap] = get_keymap_index(km)
 
-                            if properties:
-                                if all([getattr(kmitem.properties, name, None) == value for name, value in properties]):
-                                    kmi = kmitem
-                                    break
+                    # the user may have changed the event type or modifiers, so only look up via idname and properties
+                    kmis = find_keymap_items(indexes[keymap], item, exact=False)
 
-                            else:
-                                kmi = kmitem
-                                break
+                    if kmis:
+                        kmi = kmis[0]
 
                 # draw keymap item
 
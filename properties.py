@@ -1,7 +1,7 @@
 import bpy
 from bpy.props import StringProperty, IntProperty, BoolProperty, CollectionProperty, PointerProperty, EnumProperty, FloatProperty
-import bmesh
 from . items import eevee_preset_items, align_mode_items
+from . utils.mesh import snapshot_state, restore_state
 
 
 # COLLECTIONS
@@ -22,13 +22,17 @@ class HistoryUnmirroredCollection(bpy.types.PropertyGroup):
 
 class HistoryEpochCollection(bpy.types.PropertyGroup):
     name: StringProperty()
+
+    # objects hidden in this epoch, the first epoch stores none, as the native local view toggle restores them
     objects: CollectionProperty(type=HistoryObjectsCollection)
+
     unmirrored: CollectionProperty(type=HistoryUnmirroredCollection)
 
 
 # SCENE PROPERTIES
 
-selected = []
+# packed hide and select states of the edit mesh, while uv sync selection is off
+selected = {}
 
 
 class M3SceneProperties(bpy.types.PropertyGroup):
@@ -53,20 +57,12 @@ class M3SceneProperties(bpy.types.PropertyGroup):
 
         # restore previous selection
         if ts.use_uv_select_sync:
-            bpy.ops.mesh.select_all(action='DESELECT')
-
-            bm = bmesh.from_edit_mesh(active.data)
-            bm.normal_update()
-            bm.verts.ensure_lookup_table()
+            restored = restore_state(selected, hide=False) if selected else []
 
-            if selected:
-                for v in bm.verts:
-                    if v.index in selected:
-                        v.select_set(True)
+            if active.data.name not in restored:
+                bpy.ops.mesh.select_all(action='DESELECT')
 
-            bm.select_flush(True)
-
-            bmesh.update_edit_mesh(active.data)
+            selected = {}
 
             # also sync the selection mode
             # NOTE: disabled again, seems like it's beneficial to just go back to the previous mesh selection mode
@@ -75,11 +71,7 @@ class M3SceneProperties(bpy.types.PropertyGroup):
 
         # store the active selection
         else:
-            bm = bmesh.from_edit_mesh(active.data)
-            bm.normal_update()
-            bm.verts.ensure_lookup_table()
-
-            selected = [v.index for v in bm.verts if v.select]
+            selected = snapshot_state(active.data)
 
             bpy.ops.mesh.select_all(action="SELECT")
 
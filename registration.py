@@ -41,6 +41,7 @@ classes = {"CORE": [("ui.UILists", [("AppendMatsUIList", "")]),
                                                ("LoadNext", "load_next")]),
                         ("ui.operators.save", [("AppendWorld", "append_world"),
                                                ("AppendMaterial", "append_material"),
+                                               ("DedupeMaterials", "dedupe_materials"),
                                                ("LoadWorldSource", "load_world_source"),
                                                ("LoadMaterialsSource", "load_materials_source")]),
                         ("ui.operators.appendmats", [("AddSeparator", "add_separator"),
@@ -1,5 +1,6 @@
 import bpy
 from .. utils.registration import get_prefs
+from .. utils.append import get_library_catalog
 
 
 
@@ -32,6 +33,9 @@ class MenuAppendMaterials(bpy.types.Menu):
 
         names = [mat.name for mat in get_prefs().appendmats]
 
+        # names, that neither exist in the source file, nor in the current one, are drawn inactive
+        available = set(get_library_catalog(get_prefs().appendmatspath).get("materials", []))
+
         if names:
             names.insert(0, "ALL")
         else:
@@ -53,4 +57,9 @@ class MenuAppendMaterials(bpy.types.Menu):
                 mat = bpy.data.materials.get(name)
                 icon_val = layout.icon(mat) if mat else 0
 
-                layout.operator("machin3.append_material", text=name, icon_value=icon_val).name = name
+                row = layout.row()
+                row.active = bool(mat) or name in available
+                row.operator("machin3.append_material", text=name, icon_value=icon_val).name = name
+
+        layout.separator()
+        layout.operator("machin3.dedupe_materials", text="Dedupe Materials", icon="DUPLICATE")
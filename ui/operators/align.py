@@ -4,7 +4,8 @@ import bmesh
 from mathutils import Vector, Matrix, geometry
 from ... utils.math import get_center_between_verts, create_rotation_difference_matrix_from_quat, get_loc_matrix, create_selection_bbox, get_right_and_up_axes
 from ... items import axis_items, align_type_items, align_axis_mapping_dict, align_direction_items
-from ... utils.selection import get_selected_vert_sequences
+from ... utils.selection import get_selected_vert_sequences, get_selection_counts
+from ... utils.mesh import EditMesh
 
 
 class AlignEditMesh(bpy.types.Operator):
@@ -23,9 +24,8 @@ class AlignEditMesh(bpy.types.Operator):
     @classmethod
     def poll(cls, context):
         if context.mode == "EDIT_MESH":
-            active = context.active_object
-            bm = bmesh.from_edit_mesh(active.data)
-            return [v for v in bm.verts if v.select]
+            verts, _, _ = get_selection_counts(context.active_object.data)
+            return verts > 0
 
     def invoke(self, context, event):
         self.local = not event.alt
@@ -54,9 +54,8 @@ class AlignEditMesh(bpy.types.Operator):
                 axis = axis_right if direction == "HORIZONTAL" else axis_up
 
 
-        bm = bmesh.from_edit_mesh(active.data)
-        bm.normal_update()
-        bm.verts.ensure_lookup_table()
+        session = EditMesh(active.data)
+        bm = session.bm
 
         verts = [v for v in bm.verts if v.select]
 
@@ -112,8 +111,7 @@ class AlignEditMesh(bpy.types.Operator):
 
                 v.co = mx.inverted() @ world_co
 
-        bm.normal_update()
-        bmesh.update_edit_mesh(active.data)
+        session.update(normals=True)
 
 
 class CenterEditMesh(bpy.types.Operator):
@@ -130,9 +128,8 @@ class CenterEditMesh(bpy.types.Operator):
     @classmethod
     def poll(cls, context):
         if context.mode == "EDIT_MESH":
-            active = context.active_object
-            bm = bmesh.from_edit_mesh(active.data)
-            return [v for v in bm.verts if v.select]
+            verts, _, _ = get_selection_counts(context.active_object.data)
+            return verts > 0
 
     def invoke(self, context, event):
         self.local = not event.alt
@@ -155,9 +152,8 @@ class CenterEditMesh(bpy.types.Operator):
             axis_right, axis_up, flip_right, flip_up = get_right_and_up_axes(context, mx=mx if local else Matrix())
             axis = axis_right if direction == "HORIZONTAL" else axis_up
 
-        bm = bmesh.from_edit_mesh(active.data)
-        bm.normal_update()
-        bm.verts.ensure_lookup_table()
+        session = EditMesh(active.data)
+        bm = session.bm
 
         verts = [v for v in bm.verts if v.select]
 
@@ -195,7 +191,7 @@ class CenterEditMesh(bpy.types.Operator):
         for v in verts:
             v.co = mxt @ v.co
 
-        bmesh.update_edit_mesh(active.data)
+        session.update()
 
 
 class AlignObjectToEdge(bpy.types.Operator):
@@ -211,12 +207,7 @@ class AlignObjectToEdge(bpy.types.Operator):
             sel = [obj for obj in context.selected_objects if obj != active]
 
             if active and sel:
-                for obj in [active] + sel:
-                    bm = bmesh.from_edit_mesh(obj.data)
-
-                    if len([e for e in bm.edges if e.select]) != 1:
-                        return False
-                return True
+                return all(get_selection_counts(obj.data)[1] == 1 for obj in [active] + sel)
 
     def invoke(self, context, event):
         target = context.active_object
@@ -302,12 +293,7 @@ class AlignObjectToVert(bpy.types.Operator):
             sel = [obj for obj in context.selected_objects if obj != active]
 
             if active and sel:
-                for obj in [active] + sel:
-                    bm = bmesh.from_edit_mesh(obj.data)
-
-                    if len([v for v in bm.verts if v.select]) != 1:
-                        return False
-                return True
+                return all(get_selection_counts(obj.data)[0] == 1 for obj in [active] + sel)
 
     def invoke(self, context, event):
         target = context.active_object
@@ -335,15 +321,14 @@ class Straighten(bpy.types.Operator):
     @classmethod
     def poll(cls, context):
         if context.mode == 'EDIT_MESH':
-            bm = bmesh.from_edit_mesh(context.active_object.data)
-            return len([v for v in bm.verts if v.select]) > 2 and not [f for f in bm.faces if f.select]
+            verts, _, faces = get_selection_counts(context.active_object.data)
+            return verts > 2 and not faces
 
     def execute(self, context):
         active = context.active_object
 
-        bm = bmesh.from_edit_mesh(active.data)
-        bm.normal_update()
-        bm.verts.ensure_lookup_table()
+        session = EditMesh(active.data)
+        bm = session.bm
 
         verts = [v for v in bm.verts if v.select]
 
@@ -361,7 +346,7 @@ class Straighten(bpy.types.Operator):
 
                         self.straighten(bm, verts, v_start, v_end)
 
-                    bmesh.update_edit_mesh(active.data)
+                    session.update(normals=True)
 
                     return {'FINISHED'}
 
@@ -375,7 +360,7 @@ class Straighten(bpy.types.Operator):
         # straighten
         self.straighten(bm, verts, v_start, v_end)
 
-        bmesh.update_edit_mesh(active.data)
+        session.update(normals=True)
 
         return {'FINISHED'}
 
@@ -388,8 +373,6 @@ class Straighten(bpy.types.Operator):
             co, _ = geometry.intersect_point_line(v.co, v_start.co, v_end.co)
             v.co = co
 
-        bm.normal_update()
-
     def get_start_and_end_from_distance(self, verts):
         # get vert pairs from selection, using a set of frozensets removes duplicate pairings like [v, v2] and [v2, v], etc
         pairs = {frozenset([v, v2]) for v in verts for v2 in verts if v2 != v}
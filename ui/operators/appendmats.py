@@ -1,6 +1,7 @@
 import bpy
 from bpy.props import StringProperty, EnumProperty
 from ... utils.registration import get_prefs
+from ... utils.append import get_library_catalog
 
 
 def get_mat():
@@ -40,11 +41,14 @@ class Populate(bpy.types.Operator):
     def execute(self, context):
         idx, mats, _ = get_mat()
 
-        with bpy.data.libraries.load(get_prefs().appendmatspath, link=False) as (data_from, _):
-            for name in reversed(getattr(data_from, "materials")):
-                if name not in mats:
-                    am = mats.add()
-                    am.name = name
+        existing = {mat.name for mat in mats}
+
+        for name in reversed(get_library_catalog(get_prefs().appendmatspath).get("materials", [])):
+            if name not in existing:
+                am = mats.add()
+                am.name = name
+
+                existing.add(name)
 
         return {'FINISHED'}
 
@@ -1,6 +1,7 @@
 import bpy
 from bpy.props import StringProperty, BoolProperty
-from ... utils.collection import get_groups_collection, get_scene_collections
+from ... utils.collection import get_groups_collection, build_collection_index
+from ... utils.object import get_indexed_objects
 
 
 # TODO: store selected objects in blend file an immedeatly relink it into the current scene, call it StoreCollection() or SaveCollection()
@@ -128,7 +129,7 @@ class SortGroupProGroups(bpy.types.Operator):
     def execute(self, context):
         gpcol = get_groups_collection(context.scene)
 
-        groups = [obj for obj in bpy.data.objects if obj.type == "EMPTY" and obj.instance_collection]
+        groups = get_indexed_objects('instances')
 
         # link
         for group in groups:
@@ -152,8 +153,11 @@ class Purge(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        for col in get_scene_collections(context.scene):
-            if not any([col.children, col.objects]):
+        # rebuild, as the names may be out of date, if collections were renamed
+        index = build_collection_index(context.scene)
+
+        for col in list(index['collections']):
+            if not index['children'][col.name] and not index['counts'][col.name]:
                 print("Removing collection '%s'." % (col.name))
                 bpy.data.collections.remove(col, do_unlink=True)
 
@@ -1,8 +1,8 @@
 import bpy
-import random
 from bpy.props import FloatProperty, EnumProperty
 from ... utils.registration import get_addon
-from ... utils.material import get_last_node, lighten_color
+from ... utils.material import get_last_node, get_color_input, lighten_color, get_name_color, colorize_materials
+from ... utils.object import set_object_colors
 
 
 # TODO: unique preset colors for decal types
@@ -20,17 +20,8 @@ class ColorizeMaterials(bpy.types.Operator):
         return bpy.data.materials
 
     def execute(self, context):
-        for mat in bpy.data.materials:
-            node = get_last_node(mat)
-
-            if node:
-                color = node.inputs.get("Base Color")
-
-                if not color:
-                    color = node.inputs.get("Color")
-
-                if color:
-                    mat.diffuse_color = lighten_color(color=color.default_value, amount=self.lighten_amount)
+        # only materials, whose color input or viewport color changed since the last run are set
+        colorize_materials(amount=self.lighten_amount)
 
         return {'FINISHED'}
 
@@ -55,10 +46,7 @@ class ColorizeObjectsFromMaterials(bpy.types.Operator):
                 node = get_last_node(mat)
 
                 if node:
-                    color = node.inputs.get("Base Color")
-
-                    if not color:
-                        color = node.inputs.get("Color")
+                    color = get_color_input(node)
 
                     if color:
                         obj.color = lighten_color(color=color.default_value, amount=self.lighten_amount)
@@ -134,11 +122,22 @@ class ColorizeObjectsFromCollections(bpy.types.Operator):
         self.dm, _, _, _ = get_addon("DECALmachine")
 
 
+        # collection sizes are looked up once per run, not once per object
+        sizes = {}
+
+        def get_size(col):
+            if col not in sizes:
+                sizes[col] = len(col.objects)
+            return sizes[col]
+
+        def pick(cols):
+            if cols:
+                return max(cols, key=get_size) if self.multiple == "MOST" else min(cols, key=get_size)
+
         collectiondict = {}
 
         for obj in context.selected_objects:
-            cols = sorted([col for col in obj.users_collection], key=lambda c: len(c.objects), reverse=True if self.multiple == "MOST" else False)
-            # print(obj.name, [col.name for col in cols], [col.DM.isdecaltypecol for col in cols])
+            cols = obj.users_collection
 
             if self.dm:
                 if obj.DM.isdecal:
@@ -149,32 +148,27 @@ class ColorizeObjectsFromCollections(bpy.types.Operator):
                         cols = [col for col in cols if col.DM.isdecalparentcol]
 
                     if self.decalmachine == "IGNORE" and obj.parent:
-                        cols = sorted([col for col in obj.parent.users_collection], key=lambda c: len(c.objects), reverse=True if self.multiple == "MOST" else False)
+                        cols = obj.parent.users_collection
 
+            col = pick(cols)
 
-            if cols:
-                col = cols[0]
-            else:
+            if col is None:
                 col = context.scene.collection
 
-
             if col in collectiondict:
-                collectiondict[col]["objects"].append(obj)
+                collectiondict[col].append(obj)
 
             else:
-                collectiondict[col] = {}
-                collectiondict[col]["objects"] = [obj]
-                collectiondict[col]["color"] = (random.random(), random.random(), random.random(), 1)
+                collectiondict[col] = [obj]
 
 
-        for col in collectiondict:
-            objects = collectiondict[col]["objects"]
-            color = collectiondict[col]["color"]
+        # colors are derived from the collection names, so they are consistent between runs
+        colors = {}
 
-            # print(col.name, color, len(objects))
+        for col, objects in collectiondict.items():
+            colors.setdefault(get_name_color(col.name), []).extend(objects)
 
-            for obj in objects:
-                obj.color = color
+        set_object_colors(colors)
 
         self.msg = "Assigned %d unique colors." % (len(collectiondict))
 
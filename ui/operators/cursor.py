@@ -2,6 +2,7 @@ import bpy
 import bmesh
 from ... utils.math import create_rotation_matrix_from_normal, get_center_between_verts, create_rotation_matrix_from_edge
 from ... utils.scene import set_cursor
+from ... utils.mesh import EditMesh
 
 
 class CursorToOrigin(bpy.types.Operator):
@@ -55,9 +56,8 @@ class CursorToSelected(bpy.types.Operator):
         return {'FINISHED'}
 
     def cursor_to_mesh_element(self, context, active):
-        bm = bmesh.from_edit_mesh(active.data)
-        bm.normal_update()
-        bm.verts.ensure_lookup_table()
+        session = EditMesh(active.data)
+        bm = session.bm
 
         if context.scene.tool_settings.mesh_select_mode[0]:
             elements = [v for v in bm.verts if v.select]
@@ -70,6 +70,9 @@ class CursorToSelected(bpy.types.Operator):
 
         if len(elements) == 1:
 
+            # vert, edge and face normals are used to orient the cursor
+            session.ensure_normals()
+
             element = elements[0]
             mx = active.matrix_world
 
@@ -1,5 +1,6 @@
 import bpy
 from ... utils.registration import get_prefs
+from ... utils.shading import get_studio_lights
 
 
 class MatcapSwitch(bpy.types.Operator):
@@ -17,7 +18,9 @@ class MatcapSwitch(bpy.types.Operator):
         matcap1 = get_prefs().switchmatcap1
         matcap2 = get_prefs().switchmatcap2
 
-        if matcap1 and matcap2 and "NOT FOUND" not in [matcap1, matcap2]:
+        matcaps = get_studio_lights('MATCAP')
+
+        if matcap1 in matcaps and matcap2 in matcaps:
             if shading.studio_light == matcap1:
                 shading.studio_light = matcap2
 
@@ -1,6 +1,7 @@
 import bpy
 from bpy.props import BoolProperty
 from ... utils.object import parent, unparent
+from ... utils.mesh import invalidate_mesh_arrays
 
 
 class OriginToActive(bpy.types.Operator):
@@ -39,6 +40,7 @@ class OriginToActive(bpy.types.Operator):
 
             if obj.type == 'MESH':
                 obj.data.update()
+                invalidate_mesh_arrays(obj.data)
 
             if self.skip_children:
                 self.reparent_children(children, obj)
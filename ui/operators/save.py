@@ -5,8 +5,11 @@ import os
 import re
 import time
 from ... utils.registration import get_prefs, get_addon
-from ... utils.append import append_material, append_world
-from ... utils.system import add_path_to_recent_files
+from ... utils.append import append_material, append_elements, get_library_catalog
+from ... utils.system import add_path_to_recent_files, get_blend_sibling
+from ... utils.store import store_incremental, get_version_sibling, materialize_version
+from ... utils.save import log_save, compress_in_background
+from ... utils.material import dedupe_materials
 
 
 class New(bpy.types.Operator):
@@ -28,7 +31,41 @@ class New(bpy.types.Operator):
             return {'FINISHED'}
 
 
-# TODO: file size output
+def get_store_path(folder):
+    """
+    by default, the store is kept in the project folder, next to the blend files
+    """
+
+    path = get_prefs().incremental_store_path
+
+    if path:
+        return bpy.path.abspath(path)
+    return os.path.join(folder, ".incremental_store")
+
+
+def get_blend_version(filepath, step):
+    """
+    return path of current blend, all blend files in the folder, including the ones only in the incremental store, as well as the index of the blend step positions away
+    """
+
+    if get_prefs().use_incremental_store:
+        return get_version_sibling(get_store_path(os.path.dirname(filepath)), filepath, step)
+    return get_blend_sibling(filepath, step)
+
+
+def load_blend_version(path, blendname):
+    """
+    return the path of a blend file, re-assembling it from the incremental store, if it isn't on disk
+    """
+
+    loadpath = os.path.join(path, blendname)
+
+    if not os.path.exists(loadpath) and get_prefs().use_incremental_store:
+        print("Materializing %s from the incremental store" % (blendname))
+        materialize_version(get_store_path(path), loadpath)
+
+    return loadpath
+
 
 class Save(bpy.types.Operator):
     bl_idname = "machin3.save"
@@ -40,12 +77,21 @@ class Save(bpy.types.Operator):
         currentblend = bpy.data.filepath
 
         if currentblend:
-            bpy.ops.wm.save_mainfile()
+            compress = get_prefs().save_background_compression
+
+            start = time.time()
+
+            # save uncompressed and compress in the background instead, keeps the save itself quick
+            if compress:
+                result = bpy.ops.wm.save_mainfile(compress=False)
+            else:
+                result = bpy.ops.wm.save_mainfile()
+
+            entry = log_save(currentblend, time.time() - start) if 'FINISHED' in result else None
 
-            t = time.time()
-            localt = time.strftime('%H:%M:%S', time.localtime(t))
+            if compress and entry:
+                compress_in_background(currentblend, entry)
 
-            print("%s | Saved blend: %s" % (localt, currentblend))
         else:
             bpy.ops.wm.save_mainfile('INVOKE_DEFAULT')
 
@@ -71,8 +117,26 @@ class SaveIncremental(bpy.types.Operator):
             if os.path.exists(save_path):
                 self.report({'ERROR'}, "文件 '%s' 已经存在！\nBlend 尚未增量保存！" % (save_path))
             else:
-                bpy.ops.wm.save_as_mainfile(filepath=save_path)
-                print("Saved blend incrementally:", save_path)
+                store = get_prefs().use_incremental_store
+
+                # the incremental store dedupes uncompressed files much better, so don't compress those
+                compress = get_prefs().save_background_compression and not store
+
+                start = time.time()
+
+                if compress or store:
+                    result = bpy.ops.wm.save_as_mainfile(filepath=save_path, compress=False)
+                else:
+                    result = bpy.ops.wm.save_as_mainfile(filepath=save_path)
+
+                entry = log_save(save_path, time.time() - start) if 'FINISHED' in result else None
+
+                # chunk and hash in the background, after the save has returned
+                if store and entry:
+                    store_incremental(get_store_path(os.path.dirname(save_path)), save_path, previouspath=currentblend, prune=get_prefs().incremental_store_prune)
+
+                elif compress and entry:
+                    compress_in_background(save_path, entry)
         else:
             bpy.ops.wm.save_mainfile('INVOKE_DEFAULT')
 
@@ -150,7 +214,8 @@ class AppendWorld(bpy.types.Operator):
         path = get_prefs().appendworldpath
         name = get_prefs().appendworldname
 
-        world = append_world(path, name)
+        appended = append_elements(path, {"worlds": [name]})
+        world = appended["worlds"][0] if appended else None
 
         if world:
             bpy.context.scene.world = world
@@ -185,17 +250,27 @@ class AppendMaterial(bpy.types.Operator):
         name = self.name
 
         if name == "ALL":
-            all_names = [mat.name for mat in get_prefs().appendmats]
+            available = set(get_library_catalog(path).get("materials", []))
+            all_names = [mat.name for mat in get_prefs().appendmats if mat.name in available]
+
+            # append them all in a single library session
+            appended = append_elements(path, {"materials": all_names})
 
-            for name in all_names:
-                if name != "---":
-                    append_material(path, name)
+            # remove appended duplicates of materials already in the file
+            if appended:
+                dedupe_materials([mat for mat in appended["materials"] if mat])
         else:
             mat = bpy.data.materials.get(name)
 
-            if not mat or event.shift:
+            # only open the library, if the catalog lists the material
+            if (not mat or event.shift) and name in get_library_catalog(path).get("materials", []):
                 mat = append_material(path, name)
 
+                # force appending a material identical to an existing one, just uses the existing one
+                if mat:
+                    appended_name = mat.name
+                    mat = dedupe_materials([mat]).get(appended_name, mat)
+
             if mat:
                 matobjs = [obj for obj in context.selected_objects if obj.type in ['MESH', 'SURFACE', 'CURVE', 'FONT', 'META']]
 
@@ -208,6 +283,9 @@ class AppendMaterial(bpy.types.Operator):
                 if decalmachine:
                     matobjs = [obj for obj in matobjs if not obj.DM.isdecal]
 
+                # edit mesh objects and the slot index of the material, to assign it to their face selections in one go
+                editobjs = {}
+
                 for obj in matobjs:
 
                     # without any slots, create a new one and assign the material
@@ -235,27 +313,75 @@ class AppendMaterial(bpy.types.Operator):
                             obj.data.materials.append(mat)
                             slot_idx = len(obj.material_slots) - 1
 
-
-                        # update the selected faces material_index accordingly
-                        bm = bmesh.from_edit_mesh(obj.data)
-                        bm.normal_update()
-
-                        faces = [f for f in bm.faces if f.select]
-
-                        for face in faces:
-                            face.material_index = slot_idx
-
-                        bmesh.update_edit_mesh(obj.data)
+                        editobjs[obj] = slot_idx
 
                     # otherwise just apply it to the first slot
                     else:
                         obj.material_slots[0].material = mat
 
+                if editobjs:
+                    self.assign_to_selection(context, mat, editobjs)
+
             else:
                 self.report({'ERROR'}, "Material '%s' could not be appended.\nMake sure a material of that name exists in the material source file." % (name))
 
         return {'FINISHED'}
 
+    def assign_to_selection(self, context, mat, editobjs):
+        """
+        update the material_index of the selected faces of the objects in edit mode
+        material_slot_assign() does this in C for every object in the mode at once, using the active object's active material, and the first slot holding it on the others
+        """
+
+        # objects in edit mode, that aren't assigned to, like decals, but hold the material too, would have their face selections changed by material_slot_assign() as well
+        # that's the only case, where the objects are done one by one instead
+        if any(obj not in editobjs and any(slot.material == mat for slot in obj.material_slots) for obj in context.objects_in_mode):
+            for obj, slot_idx in editobjs.items():
+                bm = bmesh.from_edit_mesh(obj.data)
+
+                for face in bm.faces:
+                    if face.select:
+                        face.material_index = slot_idx
+
+                bmesh.update_edit_mesh(obj.data)
+
+        else:
+            active = context.active_object
+
+            # the active object determines the material, so make sure it's one carrying it
+            if active not in editobjs:
+                context.view_layer.objects.active = next(iter(editobjs))
+
+            obj = context.active_object
+            active_material_index = obj.active_material_index
+
+            obj.active_material_index = editobjs[obj]
+
+            bpy.ops.object.material_slot_assign()
+
+            obj.active_material_index = active_material_index
+
+            if context.active_object != active:
+                context.view_layer.objects.active = active
+
+
+class DedupeMaterials(bpy.types.Operator):
+    bl_idname = "machin3.dedupe_materials"
+    bl_label = "MACHIN3: Dedupe Materials"
+    bl_description = "Remap materials with identical node trees, like .001 duplicates, to a single material and remove the duplicates"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return bpy.data.materials
+
+    def execute(self, context):
+        remapped = dedupe_materials(debug=True)
+
+        self.report({'INFO'}, "Removed %d duplicate material%s" % (len(remapped), "" if len(remapped) == 1 else "s"))
+
+        return {'FINISHED'}
+
 
 class LoadWorldSource(bpy.types.Operator):
     bl_idname = "machin3.load_world_source"
@@ -329,7 +455,7 @@ class LoadPrevious(bpy.types.Operator):
         path, files, idx = self.get_data(bpy.data.filepath)
 
         previousblend = files[idx]
-        loadpath = os.path.join(path, previousblend)
+        loadpath = load_blend_version(path, previousblend)
 
         # add the path to the recent files list, for some reason it's not done automatically
         add_path_to_recent_files(loadpath)
@@ -343,14 +469,7 @@ class LoadPrevious(bpy.types.Operator):
         """
         return path of current blend, all blend files in the folder or the current file as well as the index of the previous blend
         """
-        currentpath = os.path.dirname(filepath)
-        currentblend = os.path.basename(filepath)
-
-        blendfiles = [f for f in sorted(os.listdir(currentpath)) if f.endswith(".blend")]
-        index = blendfiles.index(currentblend)
-        previousidx = index - 1
-
-        return currentpath, blendfiles, previousidx
+        return get_blend_version(filepath, -1)
 
 
 class LoadNext(bpy.types.Operator):
@@ -385,7 +504,7 @@ class LoadNext(bpy.types.Operator):
         path, files, idx = self.get_data(bpy.data.filepath)
 
         nextblend = files[idx]
-        loadpath = os.path.join(path, nextblend)
+        loadpath = load_blend_version(path, nextblend)
 
         # add the path to the recent files list, for some reason it's not done automatically
         add_path_to_recent_files(loadpath)
@@ -397,13 +516,6 @@ class LoadNext(bpy.types.Operator):
 
     def get_data(self, filepath):
         """
-        return path of current blend, all blend files in the folder or the current file as well as the index of the next file 
+        return path of current blend, all blend files in the folder or the current file as well as the index of the next file
         """
-        currentpath = os.path.dirname(filepath)
-        currentblend = os.path.basename(filepath)
-
-        blendfiles = [f for f in sorted(os.listdir(currentpath)) if f.endswith(".blend")]
-        index = blendfiles.index(currentblend)
-        previousidx = index + 1
-
-        return currentpath, blendfiles, previousidx
+        return get_blend_version(filepath, 1)
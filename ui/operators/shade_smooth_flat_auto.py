@@ -2,6 +2,7 @@ import bpy
 from bpy.props import IntProperty
 import bmesh
 from math import radians
+from ... utils.mesh import mark_sharp_edges, clear_edge_attributes
 
 
 class ShadeSmooth(bpy.types.Operator):
@@ -16,14 +17,13 @@ class ShadeSmooth(bpy.types.Operator):
 
             # set sharps based on face angles + activate auto smooth + enable sharp overlays
             if event.alt:
-                for obj in context.selected_objects:
-                    self.set_sharps(context.mode, obj)
+                self.set_obj_sharps(context.selected_objects)
 
                 context.space_data.overlay.show_edge_sharp = True
 
         elif context.mode == "EDIT_MESH":
             if event.alt:
-                self.set_sharps(context.mode, context.active_object)
+                self.set_mesh_sharps(context.active_object.data)
 
                 context.space_data.overlay.show_edge_sharp = True
             else:
@@ -31,20 +31,23 @@ class ShadeSmooth(bpy.types.Operator):
 
         return {'FINISHED'}
 
-    def set_sharps(self, mode, obj):
-        obj.data.use_auto_smooth = True
-        angle = obj.data.auto_smooth_angle
+    def set_obj_sharps(self, objects):
+        # linked duplicates share the mesh, so only do each one once
+        meshes = {obj.data for obj in objects if obj.type == 'MESH'}
 
-        if mode == 'OBJECT':
-            bm = bmesh.new()
-            bm.from_mesh(obj.data)
+        for mesh in meshes:
+            mesh.use_auto_smooth = True
+            mark_sharp_edges(mesh, mesh.auto_smooth_angle)
 
-        elif mode == 'EDIT_MESH':
-            bm = bmesh.from_edit_mesh(obj.data)
+    def set_mesh_sharps(self, mesh):
+        mesh.use_auto_smooth = True
+        angle = mesh.auto_smooth_angle
 
-            # smooth all faces like in object mode
-            for f in bm.faces:
-                f.smooth = True
+        bm = bmesh.from_edit_mesh(mesh)
+
+        # smooth all faces like in object mode
+        for f in bm.faces:
+            f.smooth = True
 
         bm.normal_update()
 
@@ -53,12 +56,7 @@ class ShadeSmooth(bpy.types.Operator):
         for e in sharpen:
             e.smooth = False
 
-        if mode == 'OBJECT':
-            bm.to_mesh(obj.data)
-            bm.clear()
-
-        elif mode == 'EDIT_MESH':
-            bmesh.update_edit_mesh(obj.data)
+        bmesh.update_edit_mesh(mesh)
 
         # obj.data.auto_smooth_angle = radians(180)
 
@@ -75,57 +73,53 @@ class ShadeFlat(bpy.types.Operator):
 
             # clear all sharps, bweights, seams and creases
             if event.alt:
-                for obj in context.selected_objects:
-                    self.clear_obj_sharps(obj)
+                self.clear_obj_sharps(context.selected_objects)
 
         elif context.mode == "EDIT_MESH":
             if event.alt:
-                self.clear_mesh_sharps(context.active_object.data)
+                self.clear_mesh_sharps(context)
 
             else:
                 bpy.ops.mesh.faces_shade_flat()
 
         return {'FINISHED'}
 
-    def clear_obj_sharps(self, obj):
-        obj.data.use_auto_smooth = False
+    def clear_obj_sharps(self, objects):
+        # linked duplicates share the mesh, so only do each one once
+        meshes = {obj.data for obj in objects if obj.type == 'MESH'}
 
-        bm = bmesh.new()
-        bm.from_mesh(obj.data)
-        bm.normal_update()
+        for mesh in meshes:
+            mesh.use_auto_smooth = False
+            clear_edge_attributes(mesh)
 
-        bw = bm.edges.layers.bevel_weight.verify()
-        cr = bm.edges.layers.crease.verify()
+    def clear_mesh_sharps(self, context):
+        # clear the edit meshes directly, toggling modes would write back and rebuild every edit mesh
+        meshes = {obj.data for obj in context.objects_in_mode if obj.type == 'MESH'}
 
-        for e in bm.edges:
-            e[bw] = 0
-            e[cr] = 0
-            e.smooth = True
-            e.seam = False
+        for mesh in meshes:
+            mesh.use_auto_smooth = False
 
-        bm.to_mesh(obj.data)
-        bm.clear()
+            bm = bmesh.from_edit_mesh(mesh)
 
-    def clear_mesh_sharps(self, mesh):
-        mesh.use_auto_smooth = False
+            # only clear existing layers, there's nothing to clear on missing ones
+            bw = bm.edges.layers.bevel_weight.active
+            cr = bm.edges.layers.crease.active
 
-        bm = bmesh.from_edit_mesh(mesh)
-        bm.normal_update()
+            # faltten all faces like in object mode
+            for f in bm.faces:
+                f.smooth = False
 
-        bw = bm.edges.layers.bevel_weight.verify()
-        cr = bm.edges.layers.crease.verify()
+            for e in bm.edges:
+                if bw:
+                    e[bw] = 0
 
-        # faltten all faces like in object mode
-        for f in bm.faces:
-            f.smooth = False
+                if cr:
+                    e[cr] = 0
 
-        for e in bm.edges:
-            e[bw] = 0
-            e[cr] = 0
-            e.smooth = True
-            e.seam = False
+                e.smooth = True
+                e.seam = False
 
-        bmesh.update_edit_mesh(mesh)
+            bmesh.update_edit_mesh(mesh)
 
 
 class ToggleAutoSmooth(bpy.types.Operator):
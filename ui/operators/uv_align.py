@@ -1,6 +1,6 @@
 import bpy
 from bpy.props import EnumProperty, BoolProperty
-import bmesh
+from ... utils.mesh import EditMesh
 from ... items import uv_axis_items, uv_align_axis_mapping_dict, align_type_items, align_direction_items
 
 
@@ -26,9 +26,8 @@ class AlignUV(bpy.types.Operator):
         active = context.active_object
         sync = context.scene.tool_settings.use_uv_select_sync
 
-        bm = bmesh.from_edit_mesh(active.data)
-        bm.normal_update()
-        bm.verts.ensure_lookup_table()
+        session = EditMesh(active.data)
+        bm = session.bm
 
         uvs = bm.loops.layers.uv.verify()
 
@@ -61,4 +60,4 @@ class AlignUV(bpy.types.Operator):
         for l in loops:
             l[uvs].uv[axis] = target
 
-        bmesh.update_edit_mesh(active.data)
+        session.update()
@@ -1,5 +1,7 @@
 import bpy
 from bpy.props import EnumProperty, BoolProperty
+from ... utils.object import get_scene_cameras
+
 axisitems = [("FRONT", "Front", ""),
              ("BACK", "Back", ""),
              ("LEFT", "Left", ""),
@@ -51,7 +53,7 @@ class SmartViewCam(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def invoke(self, context, event):
-        cams = [obj for obj in context.scene.objects if obj.type == "CAMERA"]
+        cams = get_scene_cameras(context.scene)
         view = context.space_data
 
         # create camera from view
@@ -91,7 +93,7 @@ class NextCam(bpy.types.Operator):
         return context.space_data.region_3d.view_perspective == 'CAMERA'
 
     def execute(self, context):
-        cams = sorted([obj for obj in context.scene.objects if obj.type == "CAMERA"], key=lambda x: x.name)
+        cams = sorted(get_scene_cameras(context.scene), key=lambda x: x.name)
 
         if len(cams) > 1:
             active = context.scene.camera
@@ -3,8 +3,11 @@ from bpy.types import Menu
 import os
 from .. utils.registration import get_prefs, get_addon
 from .. utils.ui import get_icon
-from .. utils.collection import get_scene_collections
+from .. utils.collection import get_scene_collections, get_collection_index
 from .. utils.system import abspath
+from .. utils.save import get_save_trend
+from .. utils.object import get_scene_cameras
+from .. utils.shading import get_studio_lights, get_world_background
 
 # TODO: snapping pie
 
@@ -626,6 +629,9 @@ class PieSave(Menu):
             b = column.box()
             self.draw_center_column_bottom(b)
 
+            if get_prefs().show_save_log:
+                self.draw_save_log(b)
+
         b = box.box()
         column = b.column()
         self.draw_right_column(column)
@@ -675,6 +681,23 @@ class PieSave(Menu):
         row.operator("machin3.load_previous", text="上一个", icon_value=get_icon('open_previous'))
         row.operator("machin3.load_next", text="下一个", icon_value=get_icon('open_next'))
 
+    def draw_save_log(self, col):
+        last, avg_duration, avg_size = get_save_trend()
+
+        if last:
+            size = last['compressed'] or last['size']
+
+            row = col.split(factor=0.5)
+            row.label(text="%.2fs" % (last['duration']), icon='TIME')
+            row.label(text="%.1f MB" % (size / 1048576), icon='FILE_BLEND')
+
+            # compare to the average of the previous saves
+            if avg_duration is not None:
+                row = col.split(factor=0.5)
+                row.active = False
+                row.label(text="%+.2fs" % (last['duration'] - avg_duration), icon='SORT_DESC' if last['duration'] > avg_duration else 'SORT_ASC')
+                row.label(text="%+.1f MB" % ((size - avg_size) / 1048576), icon='SORT_DESC' if size > avg_size else 'SORT_ASC')
+
     def draw_right_column(self, col):
         row = col.row()
         r = row.row(align=True)
@@ -950,7 +973,7 @@ class PieShading(Menu):
         elif view.shading.type == "MATERIAL":
 
             # use scene lights and world
-            studio_worlds = [w for w in context.preferences.studio_lights if os.path.basename(os.path.dirname(w.path)) == "world"]
+            studio_worlds = get_studio_lights('WORLD')
 
             if any([bpy.data.lights, studio_worlds]):
                 row = col.row()
@@ -971,31 +994,20 @@ class PieShading(Menu):
             # world background node props
 
             if view.shading.use_scene_world or not studio_worlds:
-                world = context.scene.world
-                if world:
-                    if world.use_nodes:
-                        tree = context.scene.world.node_tree
-                        output = tree.nodes.get("World Output")
-
-                        if output:
-                            input_surf = output.inputs.get("Surface")
+                node = get_world_background(context.scene.world)
 
-                            if input_surf:
-                                if input_surf.links:
-                                    node = input_surf.links[0].from_node
+                if node:
+                    color = node.inputs['Color']
+                    strength = node.inputs['Strength']
 
-                                    if node.type == "BACKGROUND":
-                                        color = node.inputs['Color']
-                                        strength = node.inputs['Strength']
-
-                                        if color.links:
-                                            col.prop(strength, "default_value", text="Background Strength")
-                                        else:
-                                            row = col.split(factor=0.7)
-                                            row.prop(strength, "default_value", text="Background Strength")
-                                            row.prop(color, "default_value", text="")
+                    if color.links:
+                        col.prop(strength, "default_value", text="Background Strength")
+                    else:
+                        row = col.split(factor=0.7)
+                        row.prop(strength, "default_value", text="Background Strength")
+                        row.prop(color, "default_value", text="")
 
-                                        col.separator()
+                    col.separator()
 
 
         elif view.shading.type == "RENDERED":
@@ -1193,7 +1205,7 @@ class PieViews(Menu):
         row.operator("machin3.smart_view_cam", text="智能视图摄像机", icon='HIDE_OFF')
 
         if view.region_3d.view_perspective == 'CAMERA':
-            cams = [obj for obj in scene.objects if obj.type == "CAMERA"]
+            cams = get_scene_cameras(scene)
 
             if len(cams) > 1:
                 row = col.row()
@@ -1825,7 +1837,8 @@ class PieCollections(Menu):
                 collections = get_scene_collections(context.scene)[:10]
 
             if decalmachine:
-                decalparentcollections = [col for col in get_scene_collections(context.scene, ignore_decals=False) if col.DM.isdecalparentcol][:10]
+                index = get_collection_index(context.scene)
+                decalparentcollections = [col for col in index['order'] if col.name in index['decalparents']][:10]
 
 
         if decalmachine:
@@ -1,5 +1,7 @@
 import bpy
 import os
+import json
+from . blendfile import read_id_names
 
 
 def append_group(filepath, name, link=False, relative=False):
@@ -31,17 +33,102 @@ def append_nodetree(filepath, name, link=False, relative=False):
 
 
 def append_element(filepath, collection, name, link, relative):
+    elements = append_elements(filepath, {collection: [name]}, link=link, relative=relative)
+
+    if elements:
+        return elements[collection][0]
+
+
+def append_elements(filepath, elements, link=False, relative=False):
+    """
+    append any number of datablocks of any types in a single library session, instead of opening and parsing the file for each of them
+    elements is a dict of collection names and lists of datablock names, like {"materials": ["Steel", "Rubber"], "worlds": ["Studio"]}
+    returns a dict of the same layout, with the appended datablocks, or None for each datablock, that could not be found
+    """
+
     if os.path.exists(filepath):
 
         with bpy.data.libraries.load(filepath, link=link, relative=relative) as (data_from, data_to):
-            if name in getattr(data_from, collection):
-                getattr(data_to, collection).append(name)
+            found = {}
+
+            for collection, names in elements.items():
+                available = set(getattr(data_from, collection))
+                found[collection] = [name for name in names if name in available]
+
+                for name in names:
+                    if name not in available:
+                        print("%s does not exist in %s/%s" % (name, filepath, collection))
+
+                setattr(data_to, collection, found[collection])
+
+        appended = {}
 
-            else:
-                print("%s does not exist in %s/%s" % (name, filepath, collection))
-                return
+        for collection, names in elements.items():
+            datablocks = dict(zip(found[collection], getattr(data_to, collection)))
+            appended[collection] = [datablocks.get(name) for name in names]
 
-        return getattr(data_to, collection)[0]
+        return appended
 
     else:
         print("The file %s does not exist" % (filepath))
+
+
+# LIBRARY CATALOG
+
+catalogs = {}
+
+
+def get_catalog_path():
+    return os.path.join(bpy.utils.user_resource('CONFIG'), "machin3tools_catalog.json")
+
+
+def load_catalogs():
+    try:
+        with open(get_catalog_path()) as f:
+            catalogs.update(json.load(f))
+
+    except (IOError, OSError, ValueError):
+        pass
+
+
+def save_catalogs():
+    try:
+        with open(get_catalog_path(), 'w') as f:
+            json.dump(catalogs, f)
+
+    except (IOError, OSError):
+        pass
+
+
+def get_library_catalog(filepath):
+    """
+    return the datablock names per type of a library, like {"materials": ["Steel", ...], "worlds": [...], ...}
+    catalogs are kept in memory for the session, and on disk across sessions, keyed by path, size and modification time
+    the library itself is only opened, if it changed since it was last cataloged
+    """
+
+    if not os.path.exists(filepath):
+        return {}
+
+    if not catalogs:
+        load_catalogs()
+
+    path = os.path.abspath(filepath)
+    stat = os.stat(path)
+
+    cached = catalogs.get(path)
+
+    if cached and cached['size'] == stat.st_size and cached['mtime'] == stat.st_mtime_ns:
+        return cached['catalog']
+
+    # read the block headers directly, which doesn't need blender to parse the file, fall back to a library session for unsupported files
+    catalog = read_id_names(path)
+
+    if catalog is None:
+        with bpy.data.libraries.load(path) as (data_from, _):
+            catalog = {collection: list(names) for collection, names in ((c, getattr(data_from, c)) for c in dir(data_from) if not c.startswith("_")) if isinstance(names, list)}
+
+    catalogs[path] = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "catalog": catalog}
+    save_catalogs()
+
+    return catalog
@@ -0,0 +1,215 @@
+import os
+import gzip
+import mmap
+import struct
+
+
+# minimal reader for the .blend file-block format, to list datablocks without blender, and so off the main thread as well
+# see https://developer.blender.org/docs/features/core/blend_file/
+
+id_codes = {b'AC': "actions",
+            b'AR': "armatures",
+            b'BR': "brushes",
+            b'CA': "cameras",
+            b'CF': "cache_files",
+            b'CU': "curves",
+            b'CV': "hair_curves",
+            b'GD': "grease_pencils",
+            b'GR': "collections",
+            b'IM': "images",
+            b'KE': "shape_keys",
+            b'LA': "lights",
+            b'LP': "lightprobes",
+            b'LS': "linestyles",
+            b'LT': "lattices",
+            b'MA': "materials",
+            b'MB': "metaballs",
+            b'MC': "movieclips",
+            b'ME': "meshes",
+            b'MS': "masks",
+            b'NT': "node_groups",
+            b'OB': "objects",
+            b'PA': "particles",
+            b'PC': "paint_curves",
+            b'PL': "palettes",
+            b'PT': "pointclouds",
+            b'SC': "scenes",
+            b'SN': "screens",
+            b'SO': "sounds",
+            b'SK': "speakers",
+            b'TE': "textures",
+            b'TX': "texts",
+            b'VF': "fonts",
+            b'VO': "volumes",
+            b'WM': "window_managers",
+            b'WO': "worlds",
+            b'WS': "workspaces"}
+
+gzip_magic = b'\x1f\x8b'
+
+
+def open_blend(filepath):
+    """
+    return a file-like object of the uncompressed blend data, memory mapped for uncompressed files
+    zstd compressed files, as written by blender 3.0+, are not supported
+    """
+
+    with open(filepath, 'rb') as f:
+        magic = f.read(7)
+
+    if magic.startswith(gzip_magic):
+        return gzip.open(filepath, 'rb')
+
+    elif magic == b'BLENDER':
+        with open(filepath, 'rb') as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def read_header(f):
+    """
+    return the header size, pointer size, struct endianness prefix and whether blocks use 64 bit lengths
+    """
+
+    header = f.read(12)
+
+    if not header.startswith(b'BLENDER'):
+        raise ValueError("Not a blend file")
+
+    # blender 5.0+ headers, like BLENDER17-01v0500, with 64 bit block lengths
+    if header[7:9] == b'17':
+        rest = header[12:] + f.read(5)
+        return 17, 8, '<' if rest[:1] == b'v' else '>', True
+
+    pointer_size = 8 if header[7:8] == b'-' else 4
+    endian = '<' if header[8:9] == b'v' else '>'
+
+    return 12, pointer_size, endian, False
+
+
+def read_id_names(filepath, preview=400):
+    """
+    enumerate the names of all local datablocks by type, in file order, like bpy.data.libraries.load() lists them in data_from
+    returns a dict like {"materials": ["Steel", ...], ...} or None, if the file can't be read this way
+    """
+
+    try:
+        f = open_blend(filepath)
+
+        if f is None:
+            return None
+
+        with f:
+            _, pointer_size, endian, large = read_header(f)
+
+            if large:
+                bhead = struct.Struct(endian + '4siQqq')
+            else:
+                bhead = struct.Struct(endian + '4si%sii' % ('Q' if pointer_size == 8 else 'I'))
+
+            ids = []
+            dna = None
+
+            while True:
+                data = f.read(bhead.size)
+
+                if len(data) < bhead.size:
+                    break
+
+                if large:
+                    code, _, _, length, _ = bhead.unpack(data)
+                else:
+                    code, length, _, _, _ = bhead.unpack(data)
+
+                if length < 0:
+                    raise ValueError("Invalid block length")
+
+                if code == b'ENDB':
+                    break
+
+                elif code == b'DNA1':
+                    dna = f.read(length)
+
+                # ID blocks have two letter codes, keep the start of their data, where the name is, placeholders for linked IDs are skipped
+                elif code[2:] == b'\0\0' and code[:2] not in (b'ID', b'LI'):
+                    ids.append((code[:2], f.read(min(length, preview))))
+                    f.seek(length - min(length, preview), os.SEEK_CUR)
+
+                else:
+                    f.seek(length, os.SEEK_CUR)
+
+            if dna is None:
+                return None
+
+            offset, size = get_id_name_field(dna, pointer_size, endian)
+
+            names = {}
+
+            for code, data in ids:
+                name = data[offset:offset + size].split(b'\0', 1)[0][2:]
+                names.setdefault(id_codes.get(code, code.decode('ascii', 'replace')), []).append(name.decode('utf-8', 'replace'))
+
+            return names
+
+    except (IOError, OSError, ValueError, struct.error, EOFError):
+        return None
+
+
+def get_id_name_field(dna, pointer_size, endian):
+    """
+    parse the SDNA block, to find the offset and size of the name field in the ID struct, which changes between blender versions
+    """
+
+    def align(pos):
+        return (pos + 3) & ~3
+
+    def read_strings(pos, count):
+        strings = []
+
+        for _ in range(count):
+            end = dna.index(b'\0', pos)
+            strings.append(dna[pos:end].decode('ascii', 'replace'))
+            pos = end + 1
+
+        return strings, pos
+
+    pos = 8  # SDNA + NAME
+    count, = struct.unpack_from(endian + 'i', dna, pos)
+    names, pos = read_strings(pos + 4, count)
+
+    pos = align(pos) + 4  # TYPE
+    count, = struct.unpack_from(endian + 'i', dna, pos)
+    types, pos = read_strings(pos + 4, count)
+
+    pos = align(pos) + 4  # TLEN
+    lengths = struct.unpack_from(endian + '%dh' % count, dna, pos)
+    pos = align(pos + 2 * count) + 4  # STRC
+
+    count, = struct.unpack_from(endian + 'i', dna, pos)
+    pos += 4
+
+    for _ in range(count):
+        typeidx, fieldcount = struct.unpack_from(endian + 'hh', dna, pos)
+        pos += 4
+
+        fields = struct.unpack_from(endian + '%dh' % (2 * fieldcount), dna, pos)
+        pos += 4 * fieldcount
+
+        if types[typeidx] == 'ID':
+            offset = 0
+
+            for fieldtype, fieldname in zip(fields[::2], fields[1::2]):
+                name = names[fieldname]
+
+                # array dimensions, like name[66]
+                multiplier = 1
+                for dim in name.split('[')[1:]:
+                    multiplier *= int(dim.split(']')[0])
+
+                size = (pointer_size if name.startswith(('*', '(*')) else lengths[fieldtype]) * multiplier
+
+                if name.split('[')[0] == 'name':
+                    return offset, size
+
+                offset += size
+
+    raise ValueError("ID struct not found")
@@ -1,4 +1,5 @@
 import bpy
+from collections import deque
 from . registration import get_addon
 
 
@@ -20,18 +21,112 @@ def get_groups_collection(scene):
     return gpcol
 
 
-def get_scene_collections(scene, ignore_decals=True):
-    decalmachine, _, _, _ = get_addon("DECALmachine")
+# COLLECTION INDEX
+
+# per scene collection hierarchy, dropped from the depsgraph handler in handlers.py, when collections change
+collection_indices = {}
+
+decalmachine = None
+
+
+def build_collection_index(scene):
+    """
+    walk the collection hierarchy of a scene breadth first, level by level
+    collect parent and child names, object counts, the cameras, and DECALmachine's decal collections
+    the outliner's depth first order is derived from the collected children
+    """
+
+    global decalmachine
+
+    if decalmachine is None:
+        decalmachine, _, _, _ = get_addon("DECALmachine")
+
+    index = {'count': len(bpy.data.collections),
+             'order': [],
+             'outliner': [],
+             'parents': {},
+             'children': {},
+             'counts': {},
+             'cameras': set(),
+             'decals': set(),
+             'decalparents': set()}
+
     mcol = scene.collection
+    queue = deque((col, mcol) for col in mcol.children)
+    cols = {}
+
+    while queue:
+        col, parent = queue.popleft()
+        name = col.name
+
+        # collections can be linked into several parents
+        index['parents'].setdefault(name, []).append(parent.name)
+
+        if name in index['children']:
+            continue
+
+        cols[name] = col
+
+        index['order'].append(col)
+        index['children'][name] = [child.name for child in col.children]
+        index['counts'][name] = len(col.objects)
+        index['cameras'].update(obj.as_pointer() for obj in col.objects if obj.type == 'CAMERA')
+
+        if decalmachine:
+            if col.DM.isdecaltypecol or col.DM.isdecalparentcol:
+                index['decals'].add(name)
+
+            if col.DM.isdecalparentcol:
+                index['decalparents'].add(name)
+
+        queue.extend((child, col) for child in col.children)
+
+    seen = set()
+    stack = [col.name for col in reversed(mcol.children)]
+
+    while stack:
+        name = stack.pop()
+
+        if name not in seen:
+            seen.add(name)
+            index['outliner'].append(cols[name])
+            stack.extend(reversed(index['children'][name]))
+
+    index['collections'] = [col for col in index['order'] if col.name not in index['decals']]
+
+    collection_indices[scene.name] = index
+    return index
+
+
+def get_collection_index(scene):
+    index = collection_indices.get(scene.name)
+
+    if index is None or index['count'] != len(bpy.data.collections):
+        index = build_collection_index(scene)
+
+    return index
+
+
+def update_collection_index(depsgraph):
+    if collection_indices and depsgraph.id_type_updated('COLLECTION'):
+        collection_indices.clear()
+
+
+def get_scene_collections(scene, ignore_decals=True):
+    """
+    get the collections of a scene breadth first, so the top level ones come first
+    """
+
+    index = get_collection_index(scene)
+
+    return list(index['collections'] if ignore_decals else index['order'])
+
 
-    scenecols = []
-    seen = list(mcol.children)
+def get_outliner_collections(scene, ignore_decals=True):
+    """
+    get the collections of a scene depth first, in the order of the outliner
+    """
 
-    while seen:
-        col = seen.pop(0)
-        if col not in scenecols:
-            if not (ignore_decals and decalmachine and (col.DM.isdecaltypecol or col.DM.isdecalparentcol)):
-                scenecols.append(col)
-        seen.extend(list(col.children))
+    index = get_collection_index(scene)
 
-    return scenecols
+    return [col for col in index['outliner'] if not (ignore_decals and col.name in index['decals'])]
@@ -1,7 +1,9 @@
+import bpy
 import os
 import pkgutil
 import importlib
 import time
+from collections import deque
 
 
 chronicle = []
@@ -54,3 +56,153 @@ def output_traceback(self):
 
     tb = traceback.format_exc() + "\nPLEASE REPORT THIS ERROR to mesh@machin3.io"
     self.report({'ERROR'}, tb)
+
+
+# DRAW TIMINGS
+
+# recent draw durations in ms per menu class, along with whether they went over the budget
+draw_timings = {}
+draw_budget = 2.0
+
+
+def instrument_draw(cls):
+    """
+    wrap the draw() method of a menu class, to record the duration of each draw in a ring buffer
+    """
+
+    draw = cls.draw
+
+    if getattr(draw, "instrumented", False):
+        return
+
+    def timed_draw(self, context):
+        start = time.perf_counter()
+
+        try:
+            draw(self, context)
+
+        finally:
+            duration = (time.perf_counter() - start) * 1000
+            over = duration > draw_budget
+
+            draw_timings.setdefault(cls.__name__, deque(maxlen=100)).append((duration, over))
+
+            if over:
+                print("WARNING: %s.draw() took %.2f ms, over the %.2f ms budget" % (cls.__name__, duration, draw_budget))
+
+    timed_draw.instrumented = True
+    timed_draw.original = draw
+
+    cls.draw = timed_draw
+
+
+def uninstrument_draw(cls):
+    if getattr(cls.draw, "instrumented", False):
+        cls.draw = cls.draw.original
+
+
+def get_pie_classes():
+    from .. ui import pies
+
+    return [cls for cls in vars(pies).values() if isinstance(cls, type) and issubclass(cls, bpy.types.Menu) and cls.__module__ == pies.__name__]
+
+
+def instrument_pie_draws(instrument=True, budget=None):
+    global draw_budget
+
+    if budget is not None:
+        draw_budget = budget
+
+    for cls in get_pie_classes():
+        if instrument:
+            instrument_draw(cls)
+        else:
+            uninstrument_draw(cls)
+
+    if not instrument:
+        draw_timings.clear()
+
+
+def get_draw_stats():
+    """
+    return the draw count, average and max duration in ms, and the number of draws over budget per menu
+    """
+
+    stats = {}
+
+    for name, timings in draw_timings.items():
+        durations = [duration for duration, _ in timings]
+        stats[name] = (len(durations), sum(durations) / len(durations), max(durations), sum(1 for _, over in timings if over))
+
+    return stats
+
+
+# HEADLESS DRAW HARNESS
+
+class StubLayout():
+    """
+    stand-in for a UILayout, that accepts any layout call and attribute, so draw() methods can run without a UI
+    """
+
+    def __getattr__(self, name):
+        return self.call
+
+    def call(self, *args, **kwargs):
+        return StubLayout()
+
+
+def get_stub_menu(cls, layout):
+    """
+    menus can't be instanced outside of Blender's UI, so create a plain object carrying the methods of the menu class
+    """
+
+    attrs = {}
+
+    for base in reversed(cls.__mro__):
+        if base.__module__.startswith(("bpy", "builtins")):
+            continue
+
+        attrs.update({name: value for name, value in vars(base).items() if not name.startswith("__")})
+
+    stub = type(cls.__name__, (), attrs)()
+    stub.layout = layout
+
+    return stub
+
+
+def benchmark_pie_draws(context=None, runs=100, classes=None):
+    """
+    time the draw() methods of the pie menus against a stub layout, for instance headless from CI:
+        blender -b file.blend --addons MACHIN3tools --python-expr "from MACHIN3tools.utils.developer import benchmark_pie_draws; benchmark_pie_draws()"
+    note, that pies depending on the context of a 3D view can only be drawn, when such a context is passed in
+    returns a dict like {name: (average ms, max ms, runs over budget)} or {name: error} for draws that failed
+    """
+
+    if context is None:
+        context = bpy.context
+
+    results = {}
+
+    for cls in classes or get_pie_classes():
+        stub = get_stub_menu(cls, StubLayout())
+
+        # don't double count instrumented draws
+        draw = getattr(cls.draw, "original", cls.draw)
+
+        durations = []
+
+        try:
+            for _ in range(runs):
+                start = time.perf_counter()
+                draw(stub, context)
+                durations.append((time.perf_counter() - start) * 1000)
+
+        except Exception as e:
+            results[cls.__name__] = "%s: %s" % (type(e).__name__, e)
+            print("%s: skipped, %s" % (cls.__name__, results[cls.__name__]))
+            continue
+
+        results[cls.__name__] = (sum(durations) / runs, max(durations), sum(1 for d in durations if d > draw_budget))
+        print("%s: %.3f ms average, %.3f ms max, %d of %d draws over the %.2f ms budget" % (cls.__name__, *results[cls.__name__][:2], results[cls.__name__][2], runs, draw_budget))
+
+    return results
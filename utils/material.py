@@ -1,3 +1,7 @@
+import bpy
+import os
+import hashlib
+import re
 
 
 def get_last_node(mat):
@@ -18,3 +22,275 @@ def lighten_color(color, amount):
         return (((value - 0) * new_range) / old_range) + new_low
 
     return tuple(remap(c, amount) for c in color)
+
+
+def get_name_color(name):
+    """
+    return a viewport color derived from a hash of the name, so it stays the same between runs and machines, unlike python's salted hash()
+    """
+
+    digest = hashlib.md5(name.encode('utf-8')).digest()
+    return (digest[0] / 255, digest[1] / 255, digest[2] / 255, 1)
+
+
+# VIEWPORT COLORS
+
+# fingerprint of the color input and the viewport color set from it, per material, kept across undo, so auto mode doesn't recolor everything afterwards
+material_colors = {}
+
+
+def get_color_input(node):
+    """
+    return the Base Color or Color input of the passed in node, which viewport colors are taken from
+    """
+
+    color = node.inputs.get("Base Color")
+
+    if not color:
+        color = node.inputs.get("Color")
+
+    return color
+
+
+def colorize_material(mat, amount=None, default=0.05, auto=False):
+    """
+    set the material's viewport color from its color input, unless neither the input nor the viewport color changed since the last time
+    without an amount, the one the material was last colorized with is used, or the default for materials that never were
+    in auto mode, only a changed color input counts, so viewport colors set by hand are kept
+    returns True if the viewport color was set
+    """
+
+    cached = material_colors.get(mat.name)
+
+    if amount is None:
+        amount = cached[2] if cached else default
+
+    node = get_last_node(mat)
+    color = get_color_input(node) if node else None
+
+    if not color:
+        material_colors.pop(mat.name, None)
+        return False
+
+    fingerprint = (node.name, color.identifier, get_value_signature(color.default_value), amount)
+
+    if cached and cached[0] == fingerprint and (auto or tuple(mat.diffuse_color) == cached[1]):
+        return False
+
+    mat.diffuse_color = lighten_color(color=color.default_value, amount=amount)
+    material_colors[mat.name] = (fingerprint, tuple(mat.diffuse_color), amount)
+
+    return True
+
+
+def colorize_materials(materials=None, amount=None, default=0.05, auto=False):
+    """
+    colorize the passed in or all materials, returns the number of materials, whose viewport color was set
+    """
+
+    if materials is None:
+        materials = bpy.data.materials
+
+    return sum(colorize_material(mat, amount, default=default, auto=auto) for mat in materials if mat.library is None)
+
+
+# FINGERPRINTS
+
+def get_value_signature(value):
+    """
+    turn a property value into something hashable and comparable between duplicated datablocks
+    images are referenced by their content, so duplicates like img.png.001 match, other IDs by name and filepath
+    """
+
+    if isinstance(value, bpy.types.Image):
+        return get_image_signature(value)
+
+    elif isinstance(value, bpy.types.ID):
+        return (type(value).__name__, value.name_full if hasattr(value, "name_full") else value.name, getattr(value, "filepath", None))
+
+    elif isinstance(value, bpy.types.ColorRamp):
+        return (value.interpolation, value.color_mode, tuple((e.position, tuple(e.color)) for e in value.elements))
+
+    elif isinstance(value, bpy.types.CurveMapping):
+        return tuple(tuple((tuple(p.location), p.handle_type) for p in curve.points) for curve in value.curves)
+
+    elif isinstance(value, (bool, int, float, str)) or value is None:
+        return value
+
+    try:
+        values = tuple(value)
+
+    except TypeError:
+        return type(value).__name__
+
+    # arrays, like colors and vectors, but not collections of structs
+    if all(isinstance(v, (bool, int, float, str)) for v in values):
+        return values
+    return type(value).__name__
+
+
+def get_image_signature(img):
+    """
+    packed images are compared by their data, file images by their absolute filepath, generated ones by their settings
+    """
+
+    colorspace = img.colorspace_settings.name
+
+    if img.packed_file:
+        data = getattr(img.packed_file, "data", None)
+        return ('Image', 'PACKED', colorspace, img.packed_file.size, hashlib.sha1(data).hexdigest() if data else img.filepath)
+
+    elif img.source == 'GENERATED':
+        return ('Image', img.source, colorspace, img.generated_type, tuple(img.generated_color), tuple(img.size))
+
+    return ('Image', img.source, colorspace, os.path.normcase(os.path.normpath(bpy.path.abspath(img.filepath, library=img.library))))
+
+
+node_base_properties = None
+
+
+def update_nodetree_fingerprint(h, tree, groups):
+    """
+    hash node types, node settings, unlinked input values and links of a node tree, recursing into node groups only once
+    """
+
+    global node_base_properties
+
+    if node_base_properties is None:
+        node_base_properties = {prop.identifier for prop in bpy.types.Node.bl_rna.properties}
+
+    for node in sorted(tree.nodes, key=lambda n: n.name):
+        h.update(repr((node.name, node.bl_idname)).encode())
+
+        # node specific settings, like blend types, operations, images or color ramps
+        for prop in node.bl_rna.properties:
+            if prop.identifier not in node_base_properties:
+                value = getattr(node, prop.identifier, None)
+
+                if isinstance(value, bpy.types.NodeTree):
+                    if value.name not in groups:
+                        gh = hashlib.sha1()
+                        groups[value.name] = None
+                        update_nodetree_fingerprint(gh, value, groups)
+                        groups[value.name] = gh.hexdigest()
+
+                    h.update(repr((prop.identifier, groups[value.name])).encode())
+
+                else:
+                    h.update(repr((prop.identifier, get_value_signature(value))).encode())
+
+        for socket in node.inputs:
+            if not socket.is_linked and hasattr(socket, "default_value"):
+                h.update(repr((socket.identifier, get_value_signature(socket.default_value))).encode())
+
+    for link in sorted((l.from_node.name, l.from_socket.identifier, l.to_node.name, l.to_socket.identifier) for l in tree.links):
+        h.update(repr(link).encode())
+
+
+def get_material_fingerprint(mat, groups=None):
+    """
+    content hash of a material, identical for duplicates like Material and Material.001
+    """
+
+    h = hashlib.sha1()
+    h.update(repr((tuple(mat.diffuse_color), mat.metallic, mat.roughness, mat.blend_method, mat.use_nodes)).encode())
+
+    if mat.use_nodes and mat.node_tree:
+        update_nodetree_fingerprint(h, mat.node_tree, {} if groups is None else groups)
+
+    return h.hexdigest()
+
+
+# DEDUPLICATION
+
+def get_canonical_sort_key(mat):
+    """
+    prefer linked materials, which can't be removed, then names without .001 like suffixes, then shorter names
+    """
+
+    return (mat.library is None, bool(re.search(r"\.\d{3}$", mat.name)), len(mat.name), mat.name)
+
+
+# fingerprints of the materials in the file, kept across dedupe runs, see update_material_index()
+material_index = {}
+
+
+def get_id_key(id):
+    return (id.name, id.library.filepath if id.library else None)
+
+
+def update_material_index(depsgraph):
+    """
+    drop the fingerprints of updated materials, and all of them, if node groups or images changed, as these are shared
+    """
+
+    if material_index:
+        if depsgraph.id_type_updated('IMAGE'):
+            material_index.clear()
+            return
+
+        for update in depsgraph.updates:
+            id = update.id.original
+
+            if isinstance(id, bpy.types.Material):
+                material_index.pop(get_id_key(id), None)
+
+            # node trees embedded in materials are updated along with them, only actual node groups matter
+            elif isinstance(id, bpy.types.NodeTree) and bpy.data.node_groups.get(id.name) == id:
+                material_index.clear()
+                return
+
+
+def dedupe_materials(candidates=None, debug=False):
+    """
+    remap duplicate materials to the material they duplicate, and remove them
+    with candidates, like freshly appended materials, only these are removed, otherwise any duplicate in the file is
+    only materials, that aren't in the index yet, or were changed since, are fingerprinted
+    returns a dict of each removed material's name and the material it was remapped to
+    """
+
+    groups = {}
+    index = {}
+
+    keys = {get_id_key(mat) for mat in candidates} if candidates is not None else None
+
+    # fingerprint new and changed materials, and drop the ones of removed and renamed materials
+    fingerprints = {}
+
+    for mat in bpy.data.materials:
+        key = get_id_key(mat)
+        fingerprint = material_index.get(key)
+
+        if fingerprint is None or (keys is not None and key in keys):
+            fingerprint = get_material_fingerprint(mat, groups)
+
+        fingerprints[key] = fingerprint
+
+    material_index.clear()
+    material_index.update(fingerprints)
+
+    # index all non-candidates first, so candidates are mapped onto existing materials
+    materials = sorted(bpy.data.materials, key=lambda m: (keys is not None and get_id_key(m) in keys, get_canonical_sort_key(m)))
+
+    remapped = {}
+
+    for mat in materials:
+        key = get_id_key(mat)
+        fingerprint = material_index[key]
+        existing = index.get(fingerprint)
+
+        if existing is None:
+            index[fingerprint] = mat
+
+        elif mat.library is None and (keys is None or key in keys):
+            if debug:
+                print("Remapping duplicate material %s to %s" % (mat.name, existing.name))
+
+            remapped[mat.name] = existing
+
+            del material_index[key]
+
+            mat.user_remap(existing)
+            bpy.data.materials.remove(mat, do_unlink=True)
+
+    return remapped
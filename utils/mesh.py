@@ -1,119 +1,605 @@
 import bpy
 import bmesh
+import hashlib
 from mathutils import Vector, Matrix
 import numpy as np
 
 
-def get_coords(mesh, mx=None, offset=0, indices=False):
-    verts = mesh.vertices
-    vert_count = len(verts)
+# MESH ARRAYS
+
+# arrays per mesh, keyed by name and library, marked dirty from the depsgraph handler in handlers.py, and cleared on undo and file load
+# the handler doesn't run in between the steps of an operator, so tools writing mesh data invalidate the arrays themselves
+mesh_arrays = {}
+
+
+class MeshArrays:
+    """
+    numpy arrays of a mesh, fetched lazily via foreach_get() on first access, into buffers that are re-used when the mesh is read again
+    the arrays are kept until the mesh is marked dirty, they are views into the buffers, so copy them to keep them around
+    """
+
+    __slots__ = ('mesh', 'pointer', 'buffers', 'arrays')
+
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self.pointer = mesh.as_pointer()
+        self.buffers = {}
+        self.arrays = {}
+
+    def invalidate(self):
+        self.arrays.clear()
+
+    def get_buffer(self, name, size, dtype):
+        buffer = self.buffers.get(name)
+
+        if buffer is None or len(buffer) < size:
+            buffer = np.empty(size, dtype=dtype)
+            self.buffers[name] = buffer
+
+        return buffer[:size]
+
+    def fetch(self, name, elements, prop, dtype, width=1):
+        count = len(elements)
+        array = self.arrays.get(name)
+
+        if array is None or len(array) != count:
+            buffer = self.get_buffer(name, count * width, dtype)
+            elements.foreach_get(prop, buffer)
+
+            array = buffer.reshape(count, width) if width > 1 else buffer
+            self.arrays[name] = array
+
+        return array
+
+    @property
+    def co(self):
+        return self.fetch('co', self.mesh.vertices, 'co', np.float32, 3)
+
+    @property
+    def normal(self):
+        return self.fetch('normal', self.mesh.vertices, 'normal', np.float32, 3)
+
+    @property
+    def edges(self):
+        return self.fetch('edges', self.mesh.edges, 'vertices', np.int32, 2)
+
+    @property
+    def loop_verts(self):
+        return self.fetch('loop_verts', self.mesh.loops, 'vertex_index', np.int32)
+
+    @property
+    def loop_edges(self):
+        return self.fetch('loop_edges', self.mesh.loops, 'edge_index', np.int32)
+
+    @property
+    def loop_starts(self):
+        return self.fetch('loop_starts', self.mesh.polygons, 'loop_start', np.int32)
+
+    @property
+    def loop_totals(self):
+        return self.fetch('loop_totals', self.mesh.polygons, 'loop_total', np.int32)
+
+    @property
+    def polygon_normals(self):
+        return self.fetch('polygon_normals', self.mesh.polygons, 'normal', np.float32, 3)
 
-    coords = np.empty((vert_count, 3), np.float)
-    mesh.vertices.foreach_get('co', np.reshape(coords, vert_count * 3))
+    def get_world_co(self, mx, offset=0):
+        """
+        return the vertex coordinates, optionally offset along the vertex normals, transformed by the passed in matrix
+        the rotation/scale part is applied as a 3x3 multiply into a re-used buffer, followed by an in-place translation
+        """
 
-    # offset along vertex normal
-    if offset:
-        normals = np.empty((vert_count, 3), np.float)
-        mesh.vertices.foreach_get('normal', np.reshape(normals, vert_count * 3))
+        co = self.co
+        size = len(co) * 3
 
-        coords = coords + normals * offset
+        if offset:
+            offset_co = self.get_buffer('offset_co', size, np.float32).reshape(-1, 3)
+            np.multiply(self.normal, offset, out=offset_co)
+            offset_co += co
+
+            co = offset_co
+
+        mx = np.array(mx, dtype=np.float32)
+
+        world_co = self.get_buffer('world_co', size, np.float32).reshape(-1, 3)
+        np.matmul(co, mx[:3, :3].T, out=world_co)
+        world_co += mx[:3, 3]
+
+        return world_co
+
+
+def get_mesh_key(mesh):
+    """
+    linked and local meshes can share a name, so the library tells them apart
+    """
+
+    return (mesh.name, mesh.library.filepath if mesh.library else None)
+
+
+def get_mesh_arrays(mesh):
+    """
+    get the cached MeshArrays of a mesh, this is where tools should fetch mesh arrays from
+    """
+
+    key = get_mesh_key(mesh)
+    arrays = mesh_arrays.get(key)
+
+    if arrays is None:
+        arrays = MeshArrays(mesh)
+        mesh_arrays[key] = arrays
+
+    # the mesh struct may have been re-allocated, by undo for instance, or it's a new mesh of the same name
+    elif arrays.pointer != mesh.as_pointer():
+        arrays.mesh = mesh
+        arrays.pointer = mesh.as_pointer()
+        arrays.invalidate()
+
+    return arrays
+
+
+def invalidate_mesh_arrays(meshes=None):
+    """
+    mark the arrays of one or multiple meshes dirty, or drop all of them
+    """
+
+    if meshes is None:
+        mesh_arrays.clear()
+
+    else:
+        if isinstance(meshes, bpy.types.Mesh):
+            meshes = [meshes]
+
+        for mesh in meshes:
+            arrays = mesh_arrays.get(get_mesh_key(mesh))
+
+            if arrays:
+                arrays.invalidate()
+
+
+def get_coords(mesh, mx=None, offset=0, indices=False):
+    """
+    get the vertex coordinates, optionally offset along the vertex normals and in world space, and optionally the edge indices
+    note, that the returned arrays are the cached ones of the mesh, so copy them if they are modified or need to outlive the next mesh change
+    """
+
+    arrays = get_mesh_arrays(mesh)
 
-    # bring coords into non-local space
     if mx:
-        coords_4d = np.ones((vert_count, 4), dtype=np.float)
-        coords_4d[:, :-1] = coords
+        coords = arrays.get_world_co(mx, offset=offset)
 
-        coords = np.einsum('ij,aj->ai', mx, coords_4d)[:, :-1]
+    elif offset:
+        coords = arrays.get_world_co(Matrix(), offset=offset)
 
-    # float64 seems faster to calculate than 32, + the einsum turns it into 64 anyway
-    # but float32 is needed for gpu drawing, so convert
-    coords = np.float32(coords)
+    else:
+        coords = arrays.co
 
     if indices:
-        edges = mesh.edges
-        edge_count = len(edges)
+        return coords, arrays.edges
+
+    return coords
 
-        indices = np.empty((edge_count, 2), 'i')
-        edges.foreach_get('vertices', np.reshape(indices, edge_count * 2))
 
-        return coords, indices
+# BUFFERS
 
+# preallocated constant arrays for bulk foreach_set() calls, grown as needed
+buffers = {}
 
-    return coords
+
+def get_buffer(value, count, dtype):
+    """
+    return a cached array of count times the passed in value
+    """
+
+    key = (value, np.dtype(dtype).str)
+    buffer = buffers.get(key)
+
+    if buffer is None or len(buffer) < count:
+        buffer = np.full(count, value, dtype=dtype)
+        buffers[key] = buffer
+
+    return buffer[:count]
 
 
 # MESH
 
-def hide(mesh):
-    mesh.polygons.foreach_set('hide', [True] * len(mesh.polygons))
-    mesh.edges.foreach_set('hide', [True] * len(mesh.edges))
-    mesh.vertices.foreach_set('hide', [True] * len(mesh.vertices))
+def set_state(meshes, hide=None, select=None):
+    """
+    set the hide and/or select state of all verts, edges and faces of one or multiple meshes, from the cached buffers
+    """
 
-    mesh.update()
+    if isinstance(meshes, bpy.types.Mesh):
+        meshes = [meshes]
 
+    for mesh in meshes:
+        for elements in [mesh.polygons, mesh.edges, mesh.vertices]:
+            count = len(elements)
 
-def unhide(mesh):
-    mesh.polygons.foreach_set('hide', [False] * len(mesh.polygons))
-    mesh.edges.foreach_set('hide', [False] * len(mesh.edges))
-    mesh.vertices.foreach_set('hide', [False] * len(mesh.vertices))
+            if hide is not None:
+                elements.foreach_set('hide', get_buffer(hide, count, bool))
 
-    mesh.update()
+            if select is not None:
+                elements.foreach_set('select', get_buffer(select, count, bool))
 
+        mesh.update()
 
-def unhide_select(mesh):
-    polygons = len(mesh.polygons)
-    edges = len(mesh.edges)
-    vertices = len(mesh.vertices)
 
-    mesh.polygons.foreach_set('hide', [False] * polygons)
-    mesh.edges.foreach_set('hide', [False] * edges)
-    mesh.vertices.foreach_set('hide', [False] * vertices)
+def hide(meshes):
+    set_state(meshes, hide=True)
 
-    mesh.polygons.foreach_set('select', [True] * polygons)
-    mesh.edges.foreach_set('select', [True] * edges)
-    mesh.vertices.foreach_set('select', [True] * vertices)
 
-    mesh.update()
+def unhide(meshes):
+    set_state(meshes, hide=False)
 
 
-def unhide_deselect(mesh):
-    polygons = len(mesh.polygons)
-    edges = len(mesh.edges)
-    vertices = len(mesh.vertices)
+def unhide_select(meshes):
+    set_state(meshes, hide=False, select=True)
 
-    mesh.polygons.foreach_set('hide', [False] * polygons)
-    mesh.edges.foreach_set('hide', [False] * edges)
-    mesh.vertices.foreach_set('hide', [False] * vertices)
 
-    mesh.polygons.foreach_set('select', [False] * polygons)
-    mesh.edges.foreach_set('select', [False] * edges)
-    mesh.vertices.foreach_set('select', [False] * vertices)
+def unhide_deselect(meshes):
+    set_state(meshes, hide=False, select=False)
 
-    mesh.update()
+
+def select(meshes):
+    set_state(meshes, select=True)
+
+
+def deselect(meshes):
+    set_state(meshes, select=False)
 
 
-def select(mesh):
-    mesh.polygons.foreach_set('select', [True] * len(mesh.polygons))
-    mesh.edges.foreach_set('select', [True] * len(mesh.edges))
-    mesh.vertices.foreach_set('select', [True] * len(mesh.vertices))
+def clear_edge_attributes(mesh):
+    """
+    clear bevel weights, creases, sharps and seams of all edges
+    """
+
+    edge_count = len(mesh.edges)
+
+    zeros = get_buffer(0, edge_count, np.float32)
+    falses = get_buffer(False, edge_count, bool)
+
+    mesh.edges.foreach_set('bevel_weight', zeros)
+    mesh.edges.foreach_set('crease', zeros)
+    mesh.edges.foreach_set('use_edge_sharp', falses)
+    mesh.edges.foreach_set('use_seam', falses)
 
     mesh.update()
 
 
-def deselect(mesh):
-    mesh.polygons.foreach_set('select', [False] * len(mesh.polygons))
-    mesh.edges.foreach_set('select', [False] * len(mesh.edges))
-    mesh.vertices.foreach_set('select', [False] * len(mesh.vertices))
+# SNAPSHOTS
+
+scratch = np.empty(0, dtype=bool)
+
+
+def get_scratch(count):
+    global scratch
+
+    if len(scratch) < count:
+        scratch = np.empty(count, dtype=bool)
+
+    return scratch[:count]
+
+
+def snapshot_state(meshes):
+    """
+    store the hide and select states of one or multiple meshes as packed bits, 1 bit per element and state
+    meshes in edit mode are read from their edit bmesh, as their mesh data is out of date
+    returns a dict like {mesh name: {"counts": (verts, edges, faces), "polygons.hide": bits, ...}}
+    """
+
+    if isinstance(meshes, bpy.types.Mesh):
+        meshes = [meshes]
+
+    snapshots = {}
+
+    for mesh in meshes:
+        if mesh.is_editmode:
+            bm = bmesh.from_edit_mesh(mesh)
+            snapshot = {'counts': (len(bm.verts), len(bm.edges), len(bm.faces))}
+
+            for name, elements in [('polygons', bm.faces), ('edges', bm.edges), ('vertices', bm.verts)]:
+                for prop in ['hide', 'select']:
+                    bits = np.fromiter((getattr(el, prop) for el in elements), dtype=bool, count=len(elements))
+                    snapshot['%s.%s' % (name, prop)] = np.packbits(bits)
+
+        else:
+            snapshot = {'counts': (len(mesh.vertices), len(mesh.edges), len(mesh.polygons))}
+
+            for name in ['polygons', 'edges', 'vertices']:
+                elements = getattr(mesh, name)
+                buffer = get_scratch(len(elements))
+
+                for prop in ['hide', 'select']:
+                    elements.foreach_get(prop, buffer)
+                    snapshot['%s.%s' % (name, prop)] = np.packbits(buffer)
+
+        snapshots[mesh.name] = snapshot
+
+    return snapshots
+
+
+def restore_state(snapshots, hide=True, select=True):
+    """
+    restore the hide and/or select states from snapshots, meshes whose element counts have changed in the meantime are skipped
+    when only restoring the selection, elements hidden in the meantime stay deselected
+    returns the names of the restored meshes
+    """
+
+    restored = []
+
+    for name, snapshot in snapshots.items():
+        mesh = bpy.data.meshes.get(name)
+
+        if not mesh:
+            continue
+
+        if mesh.is_editmode:
+            bm = bmesh.from_edit_mesh(mesh)
+
+            if snapshot['counts'] != (len(bm.verts), len(bm.edges), len(bm.faces)):
+                continue
 
+            for elname, elements in [('polygons', bm.faces), ('edges', bm.edges), ('vertices', bm.verts)]:
+                count = len(elements)
+
+                if hide:
+                    for el, state in zip(elements, np.unpackbits(snapshot['%s.hide' % elname])[:count]):
+                        el.hide = bool(state)
+
+                if select:
+                    for el, state in zip(elements, np.unpackbits(snapshot['%s.select' % elname])[:count]):
+                        el.select = bool(state) and not el.hide
+
+            bmesh.update_edit_mesh(mesh)
+
+        else:
+            if snapshot['counts'] != (len(mesh.vertices), len(mesh.edges), len(mesh.polygons)):
+                continue
+
+            for elname in ['polygons', 'edges', 'vertices']:
+                elements = getattr(mesh, elname)
+                count = len(elements)
+
+                if hide:
+                    elements.foreach_set('hide', np.unpackbits(snapshot['%s.hide' % elname])[:count].astype(bool))
+
+                if select:
+                    bits = np.unpackbits(snapshot['%s.select' % elname])[:count].astype(bool)
+
+                    if not hide:
+                        hidden = get_scratch(count)
+                        elements.foreach_get('hide', hidden)
+                        bits &= ~hidden
+
+                    elements.foreach_set('select', bits)
+
+            mesh.update()
+
+        restored.append(name)
+
+    return restored
+
+
+# EDGE ANGLES
+
+# per mesh cache of face normals and edge angles, so re-runs only re-evaluate edges around faces, whose vertices moved
+edge_angles = {}
+
+
+def get_topology(mesh):
+    """
+    get the loop and polygon arrays, which together define the topology of the mesh, as well as a fingerprint of them
+    """
+
+    arrays = get_mesh_arrays(mesh)
+
+    topology = {'loop_verts': arrays.loop_verts,
+                'loop_edges': arrays.loop_edges,
+                'loop_starts': arrays.loop_starts,
+                'loop_totals': arrays.loop_totals}
+
+    h = hashlib.sha1(np.array([len(mesh.vertices), len(mesh.edges)], dtype=np.int64).tobytes())
+
+    for array in topology.values():
+        h.update(array.tobytes())
+
+    topology['fingerprint'] = h.hexdigest()
+
+    return topology
+
+
+def get_ranges(starts, counts):
+    """
+    return the concatenated index ranges starts[i] to starts[i] + counts[i]
+    """
+
+    offsets = np.cumsum(counts) - counts
+    return np.arange(counts.sum(), dtype=np.int32) + np.repeat(starts - offsets, counts)
+
+
+def get_edge_faces(topology, edge_count):
+    """
+    return the indices of all manifold edges, as well as the two faces each of them connects, from the loop arrays
+    """
+
+    loop_edges = topology['loop_edges']
+    loop_starts = topology['loop_starts']
+    loop_totals = topology['loop_totals']
+
+    # face index of each loop, polygons own contiguous loop ranges, but not necessarily in polygon order
+    order = np.argsort(loop_starts)
+    loop_faces = np.repeat(order.astype(np.int32), loop_totals[order])
+
+    # group the loops by edge, manifold edges are used by exactly two loops
+    counts = np.bincount(loop_edges, minlength=edge_count)
+    starts = np.cumsum(counts) - counts
+
+    edges = np.nonzero(counts == 2)[0]
+    faces = loop_faces[np.argsort(loop_edges, kind='stable')]
+
+    return edges, faces[starts[edges]], faces[starts[edges] + 1], loop_faces
+
+
+def calc_face_normals(coords, topology, faces):
+    """
+    calculate the normals of the passed in faces via Newell's method, which matches blender's polygon normals
+    """
+
+    loop_starts = topology['loop_starts'][faces]
+    loop_totals = topology['loop_totals'][faces]
+
+    loops = get_ranges(loop_starts, loop_totals)
+
+    # the next loop in each face, wrapping around at the end
+    nxt = loops + 1
+    ends = np.cumsum(loop_totals) - 1
+    nxt[ends] = loop_starts
+
+    loop_verts = topology['loop_verts']
+    crosses = np.cross(coords[loop_verts[loops]], coords[loop_verts[nxt]])
+
+    normals = np.zeros((len(faces), 3), dtype=np.float32)
+    np.add.at(normals, np.repeat(np.arange(len(faces)), loop_totals), crosses)
+
+    lengths = np.linalg.norm(normals, axis=1)
+    lengths[lengths == 0] = 1
+
+    return normals / lengths[:, None]
+
+
+def get_face_angles(normals, faces1, faces2):
+    """
+    return the angles between pairs of face normals, like BMEdge.calc_face_angle()
+    """
+
+    dots = np.einsum('ij,ij->i', normals[faces1], normals[faces2])
+    return np.arccos(np.clip(dots, -1, 1))
+
+
+def get_edge_angles(mesh, debug=False):
+    """
+    return the indices of all manifold edges and their face angles
+    the angles are cached per mesh, when the topology is unchanged, only the edges around faces with moved vertices are re-evaluated
+    """
+
+    vert_count = len(mesh.vertices)
+
+    coords = get_mesh_arrays(mesh).co
+    topology = get_topology(mesh)
+
+    cache = edge_angles.get(mesh.name)
+
+    if cache and cache['fingerprint'] == topology['fingerprint']:
+        moved = np.nonzero(np.any(coords != cache['coords'], axis=1))[0]
+
+        if len(moved):
+            # faces using the moved vertices
+            loops = cache['vert_loops'][get_ranges(cache['vert_starts'][moved], cache['vert_counts'][moved])]
+            faces = np.unique(cache['loop_faces'][loops])
+
+            cache['normals'][faces] = calc_face_normals(coords, topology, faces)
+
+            # manifold edges of these faces
+            edges = np.unique(topology['loop_edges'][get_ranges(topology['loop_starts'][faces], topology['loop_totals'][faces])])
+            indices = cache['edge_indices'][edges]
+            indices = indices[indices >= 0]
+
+            cache['angles'][indices] = get_face_angles(cache['normals'], cache['faces1'][indices], cache['faces2'][indices])
+            cache['coords'] = coords.copy()
+
+        if debug:
+            print("re-evaluated %d of %d edges of mesh %s" % (len(indices) if len(moved) else 0, len(cache['edges']), mesh.name))
+
+        return cache['edges'], cache['angles']
+
+    edge_count = len(mesh.edges)
+    edges, faces1, faces2, loop_faces = get_edge_faces(topology, edge_count)
+
+    normals = calc_face_normals(coords, topology, np.arange(len(mesh.polygons)))
+    angles = get_face_angles(normals, faces1, faces2)
+
+    # position of each edge in the manifold edge arrays
+    edge_indices = np.full(edge_count, -1, dtype=np.int64)
+    edge_indices[edges] = np.arange(len(edges))
+
+    # loops grouped by vertex
+    vert_counts = np.bincount(topology['loop_verts'], minlength=vert_count)
+
+    edge_angles[mesh.name] = {'fingerprint': topology['fingerprint'],
+                              'coords': coords.copy(),
+                              'normals': normals,
+                              'edges': edges,
+                              'faces1': faces1,
+                              'faces2': faces2,
+                              'angles': angles,
+                              'edge_indices': edge_indices,
+                              'loop_faces': loop_faces,
+                              'vert_loops': np.argsort(topology['loop_verts'], kind='stable').astype(np.int32),
+                              'vert_counts': vert_counts,
+                              'vert_starts': np.cumsum(vert_counts) - vert_counts}
+
+    if debug:
+        print("evaluated all %d edges of mesh %s" % (len(edges), mesh.name))
+
+    return edges, angles
+
+
+def mark_sharp_edges(mesh, angle, debug=False):
+    """
+    mark all manifold edges sharp, whose face angle exceeds the passed in angle, existing sharps are kept
+    """
+
+    # drop caches of removed meshes
+    for name in [name for name in edge_angles if name not in bpy.data.meshes]:
+        del edge_angles[name]
+
+    edges, angles = get_edge_angles(mesh, debug=debug)
+
+    sharp = np.empty(len(mesh.edges), dtype=bool)
+    mesh.edges.foreach_get('use_edge_sharp', sharp)
+
+    sharp[edges[angles > angle]] = True
+
+    mesh.edges.foreach_set('use_edge_sharp', sharp)
     mesh.update()
 
+
+# EDIT MESH
+
+class EditMesh:
+    """
+    edit mode bmesh session, where operators declare whether they need normals, instead of always running normal_update() and ensure_lookup_table()
+    normals are recalculated for every session that needs them, as any tool, addon or script may have changed the edit mesh without updating them
+    """
+
+    __slots__ = ('mesh', 'bm')
+
+    def __init__(self, mesh, normals=False):
+        self.mesh = mesh
+        self.bm = bmesh.from_edit_mesh(mesh)
+
+        if normals:
+            self.ensure_normals()
+
+    def ensure_normals(self):
+        self.bm.normal_update()
+
+    def update(self, normals=False):
+        """
+        update the edit mesh after changes, optionally recalculating the normals, which is needed for correct shading of moved geometry
+        """
+
+        if normals:
+            self.bm.normal_update()
+
+        bmesh.update_edit_mesh(self.mesh)
+
+
 # BMESH
 
 def blast(mesh, prop, type):
     bm = bmesh.new()
     bm.from_mesh(mesh)
     bm.normal_update()
-    bm.verts.ensure_lookup_table()
 
     if prop == "hidden":
         faces = [f for f in bm.faces if f.hide]
@@ -129,12 +615,13 @@ def blast(mesh, prop, type):
     bm.to_mesh(mesh)
     bm.clear()
 
+    invalidate_mesh_arrays(mesh)
+
 
 def smooth(mesh, smooth=True):
     bm = bmesh.new()
     bm.from_mesh(mesh)
     bm.normal_update()
-    bm.verts.ensure_lookup_table()
 
     for f in bm.faces:
         f.smooth = smooth
@@ -152,6 +639,8 @@ def flip_normals(mesh):
     bm.to_mesh(mesh)
     bm.free()
 
+    invalidate_mesh_arrays(mesh)
+
 
 def join(target, objects, select=[]):
     mxi = target.matrix_world.inverted()
@@ -159,7 +648,6 @@ def join(target, objects, select=[]):
     bm = bmesh.new()
     bm.from_mesh(target.data)
     bm.normal_update()
-    bm.verts.ensure_lookup_table()
 
     i = bm.faces.layers.int.verify()
 
@@ -174,7 +662,6 @@ def join(target, objects, select=[]):
         bmm = bmesh.new()
         bmm.from_mesh(mesh)
         bmm.normal_update()
-        bmm.verts.ensure_lookup_table()
 
         im = bmm.faces.layers.int.verify()
 
@@ -186,6 +673,7 @@ def join(target, objects, select=[]):
 
         bm.from_mesh(mesh)
 
+        invalidate_mesh_arrays(mesh)
         bpy.data.meshes.remove(mesh, do_unlink=True)
 
     if select:
@@ -195,3 +683,5 @@ def join(target, objects, select=[]):
 
     bm.to_mesh(target.data)
     bm.clear()
+
+    invalidate_mesh_arrays(target.data)
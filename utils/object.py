@@ -1,5 +1,8 @@
 import bpy
 from mathutils import Matrix
+import numpy as np
+from . material import get_id_key
+from . collection import get_collection_index
 
 
 def parent(obj, parentobj):
@@ -62,3 +65,124 @@ def add_facemap(obj, name="", ids=[]):
         fmap.add(ids)
 
     return fmap
+
+
+# OBJECT COLORS
+
+def set_object_colors(colors):
+    """
+    bulk set viewport colors, passed in as a dict of {color: [objects]}
+    setting obj.color one by one queues a redraw notifier per object, which doesn't scale to tens of thousands of objects
+    instead all object colors are fetched, changed and written back at once, and only the changed objects are tagged
+    """
+
+    objects = bpy.data.objects
+    indices = {obj: idx for idx, obj in enumerate(objects)}
+
+    values = np.empty(len(objects) * 4, dtype=np.float32)
+    objects.foreach_get('color', values)
+    values.shape = (-1, 4)
+
+    changed = []
+
+    for color, objs in colors.items():
+        idxs = np.fromiter((indices[obj] for obj in objs), dtype=np.int64, count=len(objs))
+        mask = np.any(values[idxs] != np.array(color, dtype=np.float32), axis=1)
+
+        values[idxs] = color
+        changed.extend(obj for obj, m in zip(objs, mask) if m)
+
+    if changed:
+        objects.foreach_set('color', values.ravel())
+
+        # the color is read from the evaluated objects, so they need updating
+        for obj in changed:
+            obj.update_tag(refresh={'OBJECT'})
+
+    return len(changed)
+
+
+# OBJECT INDEX
+
+# objects by type, mirrored objects and collection instance empties, keyed by name and library, kept up to date from the depsgraph handler in handlers.py
+object_index = {}
+
+
+def is_mirrored(obj):
+    if obj.type == 'GPENCIL':
+        return any(mod.type == 'GP_MIRROR' for mod in obj.grease_pencil_modifiers)
+    return any(mod.type == 'MIRROR' for mod in obj.modifiers)
+
+
+def index_object(obj):
+    key = get_id_key(obj)
+
+    object_index['types'].setdefault(obj.type, {})[key] = obj
+
+    for indexkey, state in [('mirrored', is_mirrored(obj)), ('instances', obj.type == 'EMPTY' and obj.instance_collection is not None)]:
+        if state:
+            object_index[indexkey][key] = obj
+        else:
+            object_index[indexkey].pop(key, None)
+
+
+def build_object_index():
+    object_index.clear()
+    object_index.update({'count': len(bpy.data.objects), 'types': {}, 'mirrored': {}, 'instances': {}})
+
+    for obj in bpy.data.objects:
+        index_object(obj)
+
+
+def update_object_index(depsgraph):
+    """
+    re-index the objects updated in the depsgraph, adding or removing objects drops the index, so it's rebuilt on the next query
+    """
+
+    if object_index and depsgraph.id_type_updated('OBJECT'):
+        if object_index['count'] != len(bpy.data.objects):
+            object_index.clear()
+
+        else:
+            for update in depsgraph.updates:
+                if isinstance(update.id, bpy.types.Object):
+                    index_object(update.id.original)
+
+
+def get_indexed_objects(key, type=None):
+    """
+    return the indexed objects, key is either 'types', with the object type passed in, 'mirrored' or 'instances'
+    """
+
+    if not object_index or object_index['count'] != len(bpy.data.objects):
+        build_object_index()
+
+    entries = object_index['types'].get(type, {}) if key == 'types' else object_index[key]
+    objects = []
+
+    for key, obj in entries.items():
+        try:
+            if get_id_key(obj) == key:
+                objects.append(obj)
+                continue
+
+        except ReferenceError:
+            pass
+
+        # renamed or removed since it was indexed
+        build_object_index()
+        return get_indexed_objects(key, type)
+
+    return objects
+
+
+def get_scene_cameras(scene):
+    """
+    get the cameras of a scene, checking them against the cameras in the scene's collection index, instead of the users_scene of each camera
+    the scene collection isn't part of the index, so cameras linked to it directly are looked up by name
+    """
+
+    cameras = get_collection_index(scene)['cameras']
+    objects = scene.collection.objects
+
+    return [obj for obj in get_indexed_objects('types', 'CAMERA') if obj.as_pointer() in cameras or objects.get(obj.name) == obj]
@@ -152,28 +152,62 @@ def get_keymaps(keylist):
     # kc = wm.keyconfigs.user
 
     keymaps = []
+    indexes = {}
 
     for item in keylist:
         keymap = item.get("keymap")
 
         if keymap:
-            km = kc.keymaps.get(keymap)
+            if keymap not in indexes:
+                km = kc.keymaps.get(keymap)
+                indexes[keymap] = (km, get_keymap_index(km) if km else None)
+
+            km, index = indexes[keymap]
 
             if km:
-                idname = item.get("idname")
+                for kmi in find_keymap_items(index, item):
+                    keymaps.append((km, kmi))
 
-                for kmi in km.keymap_items:
-                    if kmi.idname == idname:
-                        properties = item.get("properties")
+    return keymaps
 
-                        if properties:
-                            if all([getattr(kmi.properties, name, None) == value for name, value in properties]):
-                                keymaps.append((km, kmi))
 
-                        else:
-                            keymaps.append((km, kmi))
+# KEYMAP INDEX
 
-    return keymaps
+def get_keymap_item_key(idname, type, value, shift=False, ctrl=False, alt=False):
+    return (idname, type, value, bool(shift), bool(ctrl), bool(alt))
+
+
+def get_keymap_index(km):
+    """
+    snapshot a keymap's items in a single pass
+    items are keyed by their idname, type, value and modifiers, as well as by their idname alone
+    several items can share a key, when they differ only in their properties
+    """
+
+    index = {}
+
+    for kmi in km.keymap_items:
+        index.setdefault(kmi.idname, []).append(kmi)
+        index.setdefault(get_keymap_item_key(kmi.idname, kmi.type, kmi.value, kmi.shift, kmi.ctrl, kmi.alt), []).append(kmi)
+
+    return index
+
+
+def find_keymap_items(index, item, exact=True):
+    """
+    look up the keymap items matching an entry of the keys dict
+    with exact, the event type, value and modifiers have to match too, otherwise only idname and properties are compared, which is necessary for user modified keymap items
+    the properties of an entry are just a subset of the kmi's properties, so they are compared on the few items sharing a key
+    """
+
+    if exact:
+        key = get_keymap_item_key(item.get("idname"), item.get("type"), item.get("value"), item.get("shift", False), item.get("ctrl", False), item.get("alt", False))
+    else:
+        key = item.get("idname")
+
+    properties = item.get("properties")
+
+    return [kmi for kmi in index.get(key, []) if not properties or all(getattr(kmi.properties, name, None) == value for name, value in properties)]
 
 
 # ICON REGISTRATION
@@ -0,0 +1,151 @@
+import bpy
+import os
+import json
+import gzip
+import shutil
+import time
+import threading
+from collections import deque
+
+
+# SAVE LOG
+
+savelog = deque(maxlen=50)
+savelog_lock = threading.Lock()
+
+datablock_types = ["objects", "meshes", "materials", "images", "node_groups", "collections", "actions", "textures"]
+
+
+def get_savelog_path():
+    return os.path.join(bpy.utils.user_resource('CONFIG'), "machin3tools_savelog.json")
+
+
+def load_savelog():
+    """
+    load the save log from disk, if it's still empty, and return a copy of its entries
+    the log is shared with the background compression thread, so it's only accessed under the savelog lock
+    """
+
+    with savelog_lock:
+        if not savelog:
+            try:
+                with open(get_savelog_path()) as f:
+                    savelog.extend(json.load(f))
+
+            except (IOError, OSError, ValueError):
+                pass
+
+        return list(savelog)
+
+
+def write_savelog():
+    with savelog_lock:
+        data = json.dumps(list(savelog))
+
+        try:
+            with open(get_savelog_path(), 'w') as f:
+                f.write(data)
+
+        except (IOError, OSError):
+            pass
+
+
+def log_save(filepath, duration):
+    """
+    record duration, size and datablock counts of a save in the rolling save log, which is kept across sessions
+    returns None, if there's no file, because the save failed or was cancelled
+    """
+
+    if not os.path.exists(filepath):
+        return None
+
+    load_savelog()
+
+    entry = {"time": time.time(),
+             "name": os.path.basename(filepath),
+             "duration": duration,
+             "size": os.path.getsize(filepath),
+             "compressed": None,
+             "datablocks": {name: len(getattr(bpy.data, name)) for name in datablock_types}}
+
+    with savelog_lock:
+        savelog.append(entry)
+
+    write_savelog()
+
+    print("%s | Saved blend: %s in %.2fs, %.2f MB" % (time.strftime('%H:%M:%S', time.localtime(entry['time'])), filepath, duration, entry['size'] / 1048576))
+
+    return entry
+
+
+def get_save_trend(count=10):
+    """
+    return the last save, as well as the average duration and size of the previous ones
+    """
+
+    entries = load_savelog()[-count:]
+
+    if entries:
+        last = entries[-1]
+        previous = entries[:-1]
+
+        if previous:
+            return last, sum(e['duration'] for e in previous) / len(previous), sum(e['compressed'] or e['size'] for e in previous) / len(previous)
+
+        return last, None, None
+    return None, None, None
+
+
+# BACKGROUND COMPRESSION
+
+compression_lock = threading.Lock()
+
+
+def compress_in_background(filepath, entry=None, level=6):
+    """
+    gzip compress a blend file, that was saved uncompressed, in a background thread
+    the compressed file replaces the uncompressed one via an atomic rename, unless the file was saved over in the meantime
+    the compressed size is then written to the passed in save log entry
+    """
+
+    if not os.path.exists(filepath):
+        return None
+
+    def run():
+        with compression_lock:
+            tmppath = filepath + ".gz.tmp"
+
+            try:
+                stat = os.stat(filepath)
+
+                with open(filepath, 'rb') as src, gzip.open(tmppath, 'wb', compresslevel=level) as dst:
+                    shutil.copyfileobj(src, dst, 1 << 22)
+
+                new = os.stat(filepath)
+
+                if (new.st_mtime_ns, new.st_size) == (stat.st_mtime_ns, stat.st_size):
+                    os.replace(tmppath, filepath)
+
+                    size = os.path.getsize(filepath)
+
+                    if entry:
+                        with savelog_lock:
+                            entry['compressed'] = size
+
+                        write_savelog()
+
+                    print("Compressed %s: %.2f MB -> %.2f MB" % (os.path.basename(filepath), stat.st_size / 1048576, size / 1048576))
+
+                else:
+                    os.remove(tmppath)
+
+            except (IOError, OSError) as e:
+                print("WARNING: Compressing %s failed: %s" % (filepath, e))
+
+                if os.path.exists(tmppath):
+                    os.remove(tmppath)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+
+    return thread
@@ -1,5 +1,14 @@
 
 
+def get_selection_counts(mesh):
+    """
+    return the numbers of selected verts, edges and faces of a mesh in edit mode
+    these are counters kept by the edit mesh, so unlike iterating over a bmesh, this is constant time, which matters in poll functions
+    """
+
+    return mesh.total_vert_sel, mesh.total_edge_sel, mesh.total_face_sel
+
+
 def get_selected_vert_sequences(verts, ensure_seq_len=False, debug=False):
     """
     return sorted lists of vertices, where vertices are considered connected if their edges are selected, and faces are not selected
@@ -0,0 +1,78 @@
+import bpy
+
+
+# STUDIO LIGHTS
+
+studio_lights = {}
+
+
+def get_studio_lights(type='MATCAP'):
+    """
+    return a dict of the studio lights of the passed in type, keyed by name, with the paths as values
+    the catalog is only rebuilt, when the number of studio lights changes, or after it was invalidated
+    """
+
+    lights = bpy.context.preferences.studio_lights
+    count = len(lights)
+
+    if studio_lights.get('count') != count:
+        studio_lights.clear()
+        studio_lights['count'] = count
+        studio_lights['types'] = {'STUDIO': {}, 'WORLD': {}, 'MATCAP': {}}
+
+        for sl in lights:
+            studio_lights['types'].setdefault(sl.type, {})[sl.name] = sl.path
+
+    return studio_lights['types'].get(type, {})
+
+
+def invalidate_studio_lights():
+    studio_lights.clear()
+
+
+# WORLD
+
+world_backgrounds = {}
+
+
+def get_world_background(world):
+    """
+    return the Background node connected to the Surface input of the World Output node, or None
+    the node name is cached per world and validated by the node and link counts of the tree
+    """
+
+    if world and world.use_nodes and world.node_tree:
+        tree = world.node_tree
+        counts = (len(tree.nodes), len(tree.links))
+
+        cached = world_backgrounds.get(world.name)
+
+        if cached and cached[0] == counts:
+            if cached[1] is None:
+                return None
+
+            node = tree.nodes.get(cached[1])
+
+            if node:
+                return node
+
+        node = None
+        output = tree.nodes.get("World Output")
+
+        if output:
+            surf = output.inputs.get("Surface")
+
+            if surf and surf.links:
+                from_node = surf.links[0].from_node
+
+                if from_node.type == "BACKGROUND":
+                    node = from_node
+
+        world_backgrounds[world.name] = (counts, node.name if node else None)
+
+        return node
+
+
+def update_world_backgrounds(depsgraph):
+    if world_backgrounds and depsgraph.id_type_updated('WORLD'):
+        world_backgrounds.clear()
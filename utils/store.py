@@ -0,0 +1,250 @@
+import os
+import json
+import hashlib
+import threading
+from bisect import bisect_left
+import numpy as np
+from . system import get_blend_siblings, natural_sort_key
+
+
+# content defined chunking, boundaries are placed where the sum of gear values of the last 64 bytes hits a bit pattern
+# unlike fixed size chunks, boundaries re-synchronize after data is inserted or removed, so unchanged regions of consecutive versions dedupe
+
+gear = np.random.RandomState(3).randint(0, 2 ** 32, 256).astype(np.uint64)
+
+window = 64
+mask = (1 << 20) - 1  # ~1MB average chunks
+min_chunk = 1 << 18
+max_chunk = 1 << 23
+read_size = 1 << 22
+
+lock = threading.Lock()
+
+
+def chunk_file(filepath):
+    """
+    yield the content defined chunks of a file
+    """
+
+    with open(filepath, 'rb') as f:
+        pending = b''
+
+        while True:
+            block = f.read(read_size)
+
+            if not block:
+                while pending:
+                    yield pending[:max_chunk]
+                    pending = pending[max_chunk:]
+                return
+
+            data = pending + block
+
+            values = gear[np.frombuffer(data, np.uint8)]
+            sums = np.cumsum(values)
+
+            # sum of each window, ending at the index
+            windowed = sums[window - 1:] - np.concatenate((np.zeros(1, np.uint64), sums[:-window]))
+            boundaries = np.nonzero((windowed & np.uint64(mask)) == 0)[0] + window
+
+            start = 0
+
+            for end in boundaries:
+                if end - start < min_chunk:
+                    continue
+
+                while end - start > max_chunk:
+                    yield data[start:start + max_chunk]
+                    start += max_chunk
+
+                yield data[start:end]
+                start = end
+
+            pending = data[start:]
+
+            while len(pending) > max_chunk:
+                yield pending[:max_chunk]
+                pending = pending[max_chunk:]
+
+
+# STORE LAYOUT
+
+def get_chunk_path(storepath, chunkhash):
+    return os.path.join(storepath, "chunks", chunkhash[:2], chunkhash)
+
+
+def get_manifest_folder(storepath, folder):
+    """
+    a store inside the project folder keys its manifests relative to it, so it keeps working when the folder is moved or shared
+    stores elsewhere key them by the absolute folder path
+    """
+
+    if os.path.dirname(os.path.abspath(storepath)) == os.path.abspath(folder):
+        return os.path.join(storepath, "manifests")
+
+    folderhash = hashlib.sha1(os.path.abspath(folder).encode('utf-8')).hexdigest()
+    return os.path.join(storepath, "manifests", folderhash)
+
+
+def get_manifest_path(storepath, filepath):
+    folder, blendname = os.path.split(os.path.abspath(filepath))
+    return os.path.join(get_manifest_folder(storepath, folder), blendname + ".json")
+
+
+def write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    tmppath = "%s.%d.tmp" % (path, threading.get_ident())
+
+    with open(tmppath, 'wb') as f:
+        f.write(data)
+
+    os.replace(tmppath, path)
+
+
+def get_manifest(storepath, filepath):
+    try:
+        with open(get_manifest_path(storepath, filepath)) as f:
+            return json.load(f)
+
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def is_stored(storepath, filepath, incremental=False):
+    """
+    check if the file on disk is the version in the store, and optionally, that it was written by an incremental save
+    """
+
+    manifest = get_manifest(storepath, filepath)
+
+    if manifest and (manifest.get('incremental') or not incremental):
+        stat = os.stat(filepath)
+        return manifest['size'] == stat.st_size and manifest['mtime'] == stat.st_mtime_ns
+
+    return False
+
+
+# STORE + MATERIALIZE
+
+def store_version(storepath, filepath, incremental=False):
+    """
+    store a file as deduplicated chunks plus a manifest listing them
+    incremental marks files written by an incremental save, only these are ever pruned
+    return the total and newly stored byte counts, or None if the file changed while being read
+    """
+
+    stat = os.stat(filepath)
+
+    chunks = []
+    new = 0
+
+    for chunk in chunk_file(filepath):
+        chunkhash = hashlib.sha256(chunk).hexdigest()
+        chunkpath = get_chunk_path(storepath, chunkhash)
+
+        if not os.path.exists(chunkpath):
+            write_atomic(chunkpath, chunk)
+            new += len(chunk)
+
+        chunks.append(chunkhash)
+
+    # the file was saved over while chunking
+    if os.stat(filepath).st_mtime_ns != stat.st_mtime_ns:
+        return None
+
+    manifest = {"name": os.path.basename(filepath),
+                "size": stat.st_size,
+                "mtime": stat.st_mtime_ns,
+                "incremental": incremental,
+                "chunks": chunks}
+
+    write_atomic(get_manifest_path(storepath, filepath), json.dumps(manifest).encode('utf-8'))
+
+    return stat.st_size, new
+
+
+def materialize_version(storepath, filepath):
+    """
+    re-assemble a stored version at its original location
+    """
+
+    manifest = get_manifest(storepath, filepath)
+
+    if not manifest:
+        return False
+
+    tmppath = filepath + ".tmp"
+
+    with open(tmppath, 'wb') as f:
+        for chunkhash in manifest['chunks']:
+            with open(get_chunk_path(storepath, chunkhash), 'rb') as c:
+                f.write(c.read())
+
+    if os.path.getsize(tmppath) != manifest['size']:
+        os.remove(tmppath)
+        return False
+
+    os.replace(tmppath, filepath)
+
+    # the materialized file is the stored version
+    manifest['mtime'] = os.stat(filepath).st_mtime_ns
+    write_atomic(get_manifest_path(storepath, filepath), json.dumps(manifest).encode('utf-8'))
+
+    return True
+
+
+def get_stored_versions(storepath, folder):
+    manifestfolder = get_manifest_folder(storepath, folder)
+
+    if os.path.exists(manifestfolder):
+        return [name[:-5] for name in os.listdir(manifestfolder) if name.endswith(".blend.json")]
+    return []
+
+
+def get_version_sibling(storepath, filepath, step):
+    """
+    like utils.system.get_blend_sibling(), but including versions, that only exist in the store
+    """
+
+    folder, blendname = os.path.split(filepath)
+    blendfiles, _ = get_blend_siblings(folder)
+
+    versions = sorted(set(blendfiles) | set(get_stored_versions(storepath, folder)), key=natural_sort_key)
+    keys = [natural_sort_key(name) for name in versions]
+
+    return folder, versions, bisect_left(keys, natural_sort_key(blendname)) + step
+
+
+# BACKGROUND STORING
+
+def store_incremental(storepath, filepath, previouspath=None, prune=False):
+    """
+    store a freshly saved incremental version in a background thread, blender's save has returned already
+    with prune, the full file of the previous version is removed once stored, as it can be materialized from the store on demand
+    but only if it was written by an incremental save itself, files created otherwise, like the original file, are never removed
+    """
+
+    def run():
+        with lock:
+            try:
+                if previouspath and os.path.exists(previouspath) and not is_stored(storepath, previouspath):
+                    if not store_version(storepath, previouspath):
+                        return
+
+                stored = store_version(storepath, filepath, incremental=True)
+
+                if stored:
+                    size, new = stored
+                    print("Stored %s in the incremental store, %.2f of %.2f MB are new" % (os.path.basename(filepath), new / 1048576, size / 1048576))
+
+                    if prune and previouspath and previouspath != filepath and is_stored(storepath, previouspath, incremental=True):
+                        os.remove(previouspath)
+
+            except (IOError, OSError) as e:
+                print("WARNING: Storing %s failed: %s" % (filepath, e))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+
+    return thread
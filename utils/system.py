@@ -1,5 +1,7 @@
 import bpy
 import os
+import re
+from bisect import bisect_left
 
 
 def abspath(path):
@@ -45,3 +47,50 @@ def makedir(pathstring):
     if not os.path.exists(pathstring):
         os.makedirs(pathstring)
     return pathstring
+
+
+# BLEND FILE SIBLINGS
+
+blend_siblings = {}
+
+
+def natural_sort_key(name):
+    """
+    sort numbers numerically, so name_9.blend comes before name_10.blend
+    """
+
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", name)], name
+
+
+def get_blend_siblings(folder):
+    """
+    return the blend files in a folder in natural sort order, as well as their sort keys
+    the folder listing is cached and only re-scanned when the folder's modification time changes
+    """
+
+    mtime = os.stat(folder).st_mtime_ns
+    cached = blend_siblings.get(folder)
+
+    if cached and cached[0] == mtime:
+        return cached[1], cached[2]
+
+    with os.scandir(folder) as entries:
+        keyed = sorted((natural_sort_key(entry.name), entry.name) for entry in entries if entry.name.endswith(".blend") and entry.is_file())
+
+    blendfiles = [name for _, name in keyed]
+    keys = [key for key, _ in keyed]
+
+    blend_siblings[folder] = (mtime, blendfiles, keys)
+
+    return blendfiles, keys
+
+
+def get_blend_sibling(filepath, step):
+    """
+    return the folder of a blend file, all blend files in it and the index of the blend file step positions away from the passed in one
+    """
+
+    folder, blendname = os.path.split(filepath)
+    blendfiles, keys = get_blend_siblings(folder)
+
+    return folder, blendfiles, bisect_left(keys, natural_sort_key(blendname)) + step
@@ -1,3 +1,6 @@
+import bpy
+from math import atan, tan
+
 
 def set_xray(context):
     x = (context.scene.M3.pass_through, context.scene.M3.show_edit_mesh_wire)
@@ -26,3 +29,53 @@ def update_local_view(space_data, states):
     if space_data.local_view:
         for obj, local in states:
             obj.local_view_set(space_data, local)
+
+
+def set_view_to_bounds(context, bmin, bmax, margin=1.4, smooth=0):
+    """
+    frame the world space bounds bmin/bmax in the view, like view3d.view_selected does, but without needing any evaluation
+    optionally transition there over smooth milliseconds
+    """
+
+    space_data = context.space_data
+    area = context.area
+    r3d = space_data.region_3d
+
+    center = (bmin + bmax) / 2
+    radius = (bmax - bmin).length / 2
+
+    # see ED_view3d_radius_to_dist(), the viewport uses a default sensor size of 32mm, don't zoom closer than the near clipping plane
+    angle = 2 * atan(16 / space_data.lens)
+    distance = max(radius * margin / tan(angle / 2), space_data.clip_start * 1.5)
+
+    if not smooth:
+        r3d.view_location = center
+        r3d.view_distance = distance
+        return
+
+    start_location = r3d.view_location.copy()
+    start_distance = r3d.view_distance
+    steps = max(int(smooth / 10), 1)
+    current = 0
+
+    def step():
+        nonlocal current
+
+        current += 1
+        factor = current / steps
+
+        # ease in and out
+        factor = factor * factor * (3 - 2 * factor)
+
+        try:
+            r3d.view_location = start_location.lerp(center, factor)
+            r3d.view_distance = start_distance + (distance - start_distance) * factor
+            area.tag_redraw()
+
+        # the view may have been closed during the transition
+        except ReferenceError:
+            return None
+
+        return 0.01 if current < steps else None
+
+    bpy.app.timers.register(step)